@@ -9,6 +9,7 @@ from alembic import context
 from dotenv import load_dotenv
 from sqlalchemy import pool
 from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
 # Load .env file
@@ -58,6 +59,17 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 
+def _is_missing_database(error: Exception) -> bool:
+    """Whether a connect error means the target database doesn't exist (3D000).
+
+    SQLAlchemy may hand asyncpg's connect-time errors through unwrapped, so
+    check both the DBAPIError wrapper and the raw asyncpg exception.
+    """
+    if isinstance(error, DBAPIError):
+        return getattr(error.orig, "pgcode", None) == "3D000"
+    return getattr(error, "sqlstate", None) == "3D000"
+
+
 def do_run_migrations(connection: Connection) -> None:
     """Run migrations with the given connection."""
     context.configure(connection=connection, target_metadata=target_metadata)
@@ -66,38 +78,33 @@ def do_run_migrations(connection: Connection) -> None:
         context.run_migrations()
 
 
-async def run_async_migrations() -> None:
-    """Run migrations in 'online' mode with async support."""
+async def create_database() -> None:
+    """Create the target database through the maintenance database."""
     from urllib.parse import urlparse
 
     import asyncpg
 
-    # Parse database URL to get connection details
-    parsed = urlparse(database_url)
-    db_name = parsed.path.lstrip('/')
+    db_name = urlparse(database_url).path.lstrip('/')
+    admin_url = database_url.replace(f"/{db_name}", "/postgres")
 
-    # Try to create database if it doesn't exist
+    # Migration DDL never benefits from JIT
+    admin_conn = await asyncpg.connect(
+        admin_url.replace("postgresql+asyncpg://", "postgresql://"),
+        server_settings={"jit": "off"},
+    )
     try:
-        # Connect to postgres database to create our target database
-        admin_url = database_url.replace(f"/{db_name}", "/postgres")
-        admin_conn = await asyncpg.connect(admin_url.replace("postgresql+asyncpg://", "postgresql://"))
-
-        # Check if database exists
-        exists = await admin_conn.fetchval(
-            "SELECT EXISTS(SELECT 1 FROM pg_database WHERE datname = $1)",
-            db_name
-        )
-
-        if not exists:
-            # Create database
-            await admin_conn.execute(f'CREATE DATABASE "{db_name}"')
-            print(f"Created database: {db_name}")
-
+        # No existence pre-check: CREATE DATABASE can't run in a DO block,
+        # so just try it and treat "already exists" as success
+        await admin_conn.execute(f'CREATE DATABASE "{db_name}"')
+        print(f"Created database: {db_name}")
+    except asyncpg.DuplicateDatabaseError:
+        pass  # Created concurrently by another migration run
+    finally:
         await admin_conn.close()
-    except Exception as e:
-        # If we can't create the database, continue anyway - maybe it exists
-        print(f"Note: Could not check/create database: {e}")
 
+
+async def run_async_migrations() -> None:
+    """Run migrations in 'online' mode with async support."""
     configuration = config.get_section(config.config_ini_section)
     configuration["sqlalchemy.url"] = database_url
 
@@ -107,8 +114,20 @@ async def run_async_migrations() -> None:
         poolclass=pool.NullPool,
     )
 
-    async with connectable.connect() as connection:
+    # Connect straight to the target database; only a missing database
+    # (SQLSTATE 3D000) costs the extra connection to create it
+    try:
+        connection = await connectable.connect()
+    except Exception as e:
+        if not _is_missing_database(e):
+            raise
+        await create_database()
+        connection = await connectable.connect()
+
+    try:
         await connection.run_sync(do_run_migrations)
+    finally:
+        await connection.close()
 
     await connectable.dispose()
 
@@ -0,0 +1,197 @@
+"""Partition memories by tenant
+
+Revision ID: 1a7c3e9f5b20
+Revises: f4c7a0d85e12
+Create Date: 2026-10-16 13:52:08.441917
+
+Every tenant's memories table becomes a LIST partition of one parent,
+public.memories_by_tenant. Each partition stays in its tenant's schema under
+the name "memories", so everything that runs with the tenant search_path is
+unchanged, while VACUUM/ANALYZE and cross-tenant queries can go through the
+parent. Each partition keeps its own HNSW index, sized to the tenant.
+
+The parent is deliberately *not* called memories: with search_path
+"<tenant>, public", a tenant without a partition would otherwise resolve
+"memories" to the parent and see every tenant's rows.
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '1a7c3e9f5b20'
+down_revision: str | None = 'f4c7a0d85e12'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def _hnsw_params(vector_count: int) -> dict[str, int]:
+    """Frozen copy of configure_hnsw_params's size tiers at this revision."""
+    if vector_count < 100_000:
+        return {"m": 16, "ef_construction": 64, "ef_search": 40}
+    if vector_count < 1_000_000:
+        return {"m": 24, "ef_construction": 128, "ef_search": 100}
+    return {"m": 32, "ef_construction": 256, "ef_search": 200}
+
+BATCH_SIZE = 10_000
+
+
+def _tenant_schemas() -> list[str]:
+    """Find every tenant schema with a memories table."""
+    rows = op.get_bind().execute(sa.text("""
+        SELECT table_schema
+        FROM information_schema.tables
+        WHERE table_name = 'memories'
+        AND table_schema <> 'public'
+        ORDER BY table_schema
+    """))
+    return [row.table_schema for row in rows]
+
+
+def _literal(value: str) -> str:
+    """Quote a string as an SQL literal (DDL can't take bind parameters)."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _index_ddl(schema: str, hnsw: dict[str, int]) -> list[str]:
+    """Index statements for one tenant partition."""
+    table = f'"{schema}".memories'
+    return [
+        f"""
+        CREATE INDEX idx_memories_content_fts ON {table}
+        USING gin (to_tsvector('english', content)) WHERE NOT forgotten
+        """,
+        f"""
+        CREATE INDEX idx_memories_embedding ON {table}
+        USING hnsw (embedding halfvec_ip_ops)
+        WITH (m = {hnsw["m"]}, ef_construction = {hnsw["ef_construction"]})
+        """,
+        f"CREATE INDEX idx_memories_forgotten ON {table} (forgotten) WHERE NOT forgotten",
+        f"CREATE INDEX idx_memories_metadata_tags ON {table} USING gin ((metadata->'tags'))",
+        f"CREATE INDEX idx_memories_metadata_entities ON {table} USING gin ((metadata->'entities'))",
+        f"CREATE INDEX idx_memories_active_created ON {table} (forgotten, created_at DESC)",
+        f"CREATE INDEX idx_memories_metadata_path ON {table} USING gin (metadata jsonb_path_ops)",
+        f"CREATE INDEX idx_memories_created_at ON {table} (created_at DESC) WHERE NOT forgotten",
+    ]
+
+
+def upgrade() -> None:
+    """Move each tenant's memories into a partition of memories_by_tenant."""
+    bind = op.get_bind()
+    schemas = _tenant_schemas()
+
+    op.execute("CREATE SEQUENCE IF NOT EXISTS public.memories_by_tenant_id_seq")
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS public.memories_by_tenant (
+            id INTEGER NOT NULL DEFAULT nextval('public.memories_by_tenant_id_seq'),
+            tenant TEXT NOT NULL,
+            content TEXT NOT NULL,
+            embedding halfvec(768),
+            forgotten BOOLEAN DEFAULT false,
+            metadata JSONB DEFAULT '{}',
+            created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+            -- id leads so lookups by id alone can use the key
+            PRIMARY KEY (id, tenant),
+            CONSTRAINT content_not_empty CHECK (char_length(content) > 0),
+            CONSTRAINT content_max_length CHECK (char_length(content) <= 7500)
+        ) PARTITION BY LIST (tenant)
+    """)
+    op.execute(
+        "ALTER SEQUENCE public.memories_by_tenant_id_seq "
+        "OWNED BY public.memories_by_tenant.id"
+    )
+
+    # Swap in an empty partition per tenant; the old table is kept until
+    # its rows have been copied
+    for schema in schemas:
+        op.execute(f'ALTER TABLE "{schema}".memories RENAME TO memories_unpartitioned')
+        op.execute(
+            f'ALTER INDEX IF EXISTS "{schema}".memories_pkey '
+            "RENAME TO memories_unpartitioned_pkey"
+        )
+        op.execute(f"""
+            CREATE TABLE "{schema}".memories
+            PARTITION OF public.memories_by_tenant FOR VALUES IN ({_literal(schema)})
+        """)
+        # Inserts through the partition don't have to name their tenant
+        op.execute(
+            f'ALTER TABLE "{schema}".memories '
+            f"ALTER COLUMN tenant SET DEFAULT {_literal(schema)}"
+        )
+
+    # Copy in keyset-paginated batches, committing each one, so no single
+    # transaction has to hold or log a whole tenant
+    with op.get_context().autocommit_block():
+        for schema in schemas:
+            last_id = 0
+            while True:
+                last_id = bind.execute(
+                    sa.text(f"""
+                        WITH batch AS (
+                            INSERT INTO "{schema}".memories
+                                (id, content, embedding, forgotten, metadata, created_at)
+                            SELECT id, content, embedding, forgotten, metadata, created_at
+                            FROM "{schema}".memories_unpartitioned
+                            WHERE id > :last_id
+                            ORDER BY id
+                            LIMIT :batch_size
+                            RETURNING id
+                        )
+                        SELECT MAX(id) FROM batch
+                    """),  # noqa: S608
+                    {"last_id": last_id, "batch_size": BATCH_SIZE},
+                ).scalar_one()
+                if last_id is None:
+                    break
+
+    # Keep ids unique going forward (existing ids only need (id, tenant))
+    op.execute("""
+        SELECT setval(
+            'public.memories_by_tenant_id_seq',
+            COALESCE((SELECT MAX(id) FROM public.memories_by_tenant), 0) + 1,
+            false
+        )
+    """)
+
+    op.execute("SET LOCAL maintenance_work_mem = '2GB'")
+
+    # Index the loaded partitions (cheaper than maintaining during the copy)
+    for schema in schemas:
+        op.execute(f'DROP TABLE "{schema}".memories_unpartitioned')
+        count = bind.execute(
+            sa.text(f'SELECT COUNT(*) FROM "{schema}".memories WHERE embedding IS NOT NULL')  # noqa: S608
+        ).scalar_one()
+        for ddl in _index_ddl(schema, _hnsw_params(count)):
+            op.execute(ddl)
+
+    op.execute("ANALYZE public.memories_by_tenant")
+
+
+def downgrade() -> None:
+    """Detach every partition back into a standalone per-tenant table."""
+    for schema in _tenant_schemas():
+        table = f'"{schema}".memories'
+        op.execute(f"ALTER TABLE public.memories_by_tenant DETACH PARTITION {table}")
+
+        # Dropping the partition key also drops the (id, tenant) key
+        op.execute(f"ALTER TABLE {table} DROP COLUMN tenant")
+        op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id)")
+
+        # Give the table its own serial sequence again
+        op.execute(f'CREATE SEQUENCE "{schema}".memories_id_seq OWNED BY {table}.id')
+        op.execute(
+            f"ALTER TABLE {table} "
+            f"ALTER COLUMN id SET DEFAULT nextval('\"{schema}\".memories_id_seq')"
+        )
+        op.execute(f"""
+            SELECT setval(
+                '"{schema}".memories_id_seq',
+                COALESCE((SELECT MAX(id) FROM {table}), 0) + 1,
+                false
+            )
+        """)  # noqa: S608
+
+    op.execute("DROP TABLE IF EXISTS public.memories_by_tenant")
@@ -0,0 +1,138 @@
+"""Split forgotten memories into their own partition
+
+Revision ID: 2b8d4f6a0c31
+Revises: 1a7c3e9f5b20
+Create Date: 2026-10-16 14:37:45.019284
+
+Each tenant's memories partition is itself partitioned by forgotten:
+memories_active (false) carries every search index, memories_forgotten
+(true) only the primary key, which now includes forgotten because a
+partitioned table's key must cover all of its partitioning columns. Queries with "WHERE NOT forgotten" are pruned to the
+active partition, so the HNSW graph no longer spends edges on tombstones
+and ef_search only explores live vectors.
+
+The existing table is attached as memories_active, so its rows and indexes
+(HNSW included) are reused rather than copied and rebuilt; only forgotten
+rows move.
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '2b8d4f6a0c31'
+down_revision: str | None = '1a7c3e9f5b20'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+COLUMNS = "id, tenant, content, embedding, forgotten, metadata, created_at"
+
+
+def _tenant_partitions() -> list[tuple[str, str]]:
+    """Find every tenant partition of memories_by_tenant as (schema, tenant)."""
+    rows = op.get_bind().execute(sa.text("""
+        SELECT n.nspname AS schema, pg_get_expr(c.relpartbound, c.oid) AS bound
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE i.inhparent = 'public.memories_by_tenant'::regclass
+        ORDER BY n.nspname
+    """))
+    # bound looks like: FOR VALUES IN ('claude')
+    return [(row.schema, row.bound) for row in rows]
+
+
+def upgrade() -> None:
+    """Give each tenant an active and a forgotten sub-partition."""
+    op.execute("UPDATE public.memories_by_tenant SET forgotten = false WHERE forgotten IS NULL")
+    op.execute("ALTER TABLE public.memories_by_tenant ALTER COLUMN forgotten SET NOT NULL")
+
+    # A partitioned table's key must cover every partitioning column, so
+    # forgotten joins it (id still leads, for id-only lookups)
+    op.execute("ALTER TABLE public.memories_by_tenant DROP CONSTRAINT memories_by_tenant_pkey")
+
+    for schema, bound in _tenant_partitions():
+        table = f'"{schema}".memories'
+        default = op.get_bind().execute(sa.text("""
+            SELECT pg_get_expr(d.adbin, d.adrelid)
+            FROM pg_attrdef d
+            JOIN pg_attribute a ON a.attrelid = d.adrelid AND a.attnum = d.adnum
+            WHERE d.adrelid = CAST(:table AS regclass) AND a.attname = 'tenant'
+        """), {"table": table}).scalar_one()
+
+        # The current table becomes the active partition
+        op.execute(f"ALTER TABLE public.memories_by_tenant DETACH PARTITION {table}")
+        op.execute(f"ALTER TABLE {table} RENAME TO memories_active")
+
+        op.execute(f"""
+            CREATE TABLE {table}
+            PARTITION OF public.memories_by_tenant {bound}
+            PARTITION BY LIST (forgotten)
+        """)
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN tenant SET DEFAULT {default}")
+        op.execute(f"""
+            CREATE TABLE "{schema}".memories_forgotten
+            PARTITION OF {table} FOR VALUES IN (true)
+        """)
+
+        # Move tombstones out, then attach what's left without copying it
+        op.execute(f"""
+            WITH moved AS (
+                DELETE FROM "{schema}".memories_active
+                WHERE forgotten
+                RETURNING {COLUMNS}
+            )
+            INSERT INTO "{schema}".memories_forgotten ({COLUMNS})
+            SELECT {COLUMNS} FROM moved
+        """)  # noqa: S608
+        op.execute(f"""
+            ALTER TABLE {table}
+            ATTACH PARTITION "{schema}".memories_active FOR VALUES IN (false)
+        """)
+
+        # Partition pruning now does what these did
+        op.execute(f'DROP INDEX IF EXISTS "{schema}".idx_memories_forgotten')
+        op.execute(f'DROP INDEX IF EXISTS "{schema}".idx_memories_active_created')
+
+    op.execute("ALTER TABLE public.memories_by_tenant ADD PRIMARY KEY (id, tenant, forgotten)")
+
+
+def downgrade() -> None:
+    """Fold each tenant's forgotten rows back into a single partition."""
+    op.execute("ALTER TABLE public.memories_by_tenant DROP CONSTRAINT memories_by_tenant_pkey")
+
+    for schema, bound in _tenant_partitions():
+        table = f'"{schema}".memories'
+        active = f'"{schema}".memories_active'
+        default = op.get_bind().execute(sa.text("""
+            SELECT pg_get_expr(d.adbin, d.adrelid)
+            FROM pg_attrdef d
+            JOIN pg_attribute a ON a.attrelid = d.adrelid AND a.attnum = d.adnum
+            WHERE d.adrelid = CAST(:table AS regclass) AND a.attname = 'tenant'
+        """), {"table": table}).scalar_one()
+
+        op.execute(f"ALTER TABLE {table} DETACH PARTITION {active}")
+        op.execute(f"""
+            INSERT INTO {active} ({COLUMNS})
+            SELECT {COLUMNS} FROM "{schema}".memories_forgotten
+        """)  # noqa: S608
+        op.execute(f"ALTER TABLE public.memories_by_tenant DETACH PARTITION {table}")
+        op.execute(f"DROP TABLE {table}")  # Takes memories_forgotten with it
+
+        op.execute(f"ALTER TABLE {active} RENAME TO memories")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN tenant SET DEFAULT {default}")
+        op.execute(f"ALTER TABLE public.memories_by_tenant ATTACH PARTITION {table} {bound}")
+
+        op.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_memories_forgotten
+            ON {table} (forgotten) WHERE NOT forgotten
+        """)
+        op.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_memories_active_created
+            ON {table} (forgotten, created_at DESC)
+        """)
+
+    op.execute("ALTER TABLE public.memories_by_tenant ADD PRIMARY KEY (id, tenant)")
+    op.execute("ALTER TABLE public.memories_by_tenant ALTER COLUMN forgotten DROP NOT NULL")
@@ -0,0 +1,104 @@
+"""Tune HNSW parameters by tenant size
+
+Revision ID: a3f1c9e2b7d4
+Revises: dd3602e12c39
+Create Date: 2026-10-16 09:12:44.503118
+
+"""
+import logging
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f1c9e2b7d4'
+down_revision: str | None = 'dd3602e12c39'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def _hnsw_params(vector_count: int) -> dict[str, int]:
+    """Frozen copy of configure_hnsw_params's size tiers at this revision."""
+    if vector_count < 100_000:
+        return {"m": 16, "ef_construction": 64, "ef_search": 40}
+    if vector_count < 1_000_000:
+        return {"m": 24, "ef_construction": 128, "ef_search": 100}
+    return {"m": 32, "ef_construction": 256, "ef_search": 200}
+
+
+def _hnsw_indexes() -> list[tuple[str, str]]:
+    """Find every tenant's HNSW embedding index as (schema, index) pairs."""
+    rows = op.get_bind().execute(sa.text("""
+        SELECT schemaname, indexname
+        FROM pg_indexes
+        WHERE tablename = 'memories'
+        AND indexdef LIKE '%USING hnsw%'
+        ORDER BY schemaname
+    """))
+    return [(row.schemaname, row.indexname) for row in rows]
+
+
+def _rebuild(schema: str, index: str, m: int, ef_construction: int) -> None:
+    """Change an index's build parameters and rebuild it without blocking writes."""
+    op.execute(
+        f'ALTER INDEX "{schema}"."{index}" '
+        f"SET (m = {m}, ef_construction = {ef_construction})"
+    )
+    with op.get_context().autocommit_block():
+        op.execute(f'REINDEX INDEX CONCURRENTLY "{schema}"."{index}"')
+
+
+def _set_ef_search(ef_search: int) -> None:
+    """Set the database-wide default hnsw.ef_search for new sessions."""
+    op.execute(f"""
+        DO $$
+        BEGIN
+            EXECUTE format(
+                'ALTER DATABASE %I SET hnsw.ef_search = {ef_search}',
+                current_database()
+            );
+        END $$;
+    """)
+
+
+def upgrade() -> None:
+    """Rebuild each tenant's HNSW index with parameters sized to its data."""
+    bind = op.get_bind()
+    ef_search = _hnsw_params(0)["ef_search"]
+
+    for schema, index in _hnsw_indexes():
+        count = bind.execute(
+            sa.text(
+                f'SELECT COUNT(*) FROM "{schema}".memories WHERE embedding IS NOT NULL'  # noqa: S608
+            )
+        ).scalar_one()
+        params = _hnsw_params(count)
+        logger.info("%s: %d vectors -> %s", schema, count, params)
+
+        _rebuild(schema, index, params["m"], params["ef_construction"])
+
+        # ef_search is per database, so size it for the largest tenant
+        ef_search = max(ef_search, params["ef_search"])
+
+    _set_ef_search(ef_search)
+
+
+def downgrade() -> None:
+    """Restore pgvector's default HNSW parameters on every tenant."""
+    defaults = _hnsw_params(0)
+
+    for schema, index in _hnsw_indexes():
+        _rebuild(schema, index, defaults["m"], defaults["ef_construction"])
+
+    op.execute("""
+        DO $$
+        BEGIN
+            EXECUTE format(
+                'ALTER DATABASE %I RESET hnsw.ef_search',
+                current_database()
+            );
+        END $$;
+    """)
@@ -0,0 +1,89 @@
+"""Store embeddings as halfvec
+
+Revision ID: b7e4d2a91c05
+Revises: a3f1c9e2b7d4
+Create Date: 2026-10-16 10:03:27.117842
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e4d2a91c05'
+down_revision: str | None = 'a3f1c9e2b7d4'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def _hnsw_params(vector_count: int) -> dict[str, int]:
+    """Frozen copy of configure_hnsw_params's size tiers at this revision."""
+    if vector_count < 100_000:
+        return {"m": 16, "ef_construction": 64, "ef_search": 40}
+    if vector_count < 1_000_000:
+        return {"m": 24, "ef_construction": 128, "ef_search": 100}
+    return {"m": 32, "ef_construction": 256, "ef_search": 200}
+
+# halfvec and its operator classes arrived in pgvector 0.7.0
+MIN_PGVECTOR_VERSION = (0, 7, 0)
+
+
+def _embedding_indexes() -> list[tuple[str, str]]:
+    """Find every tenant's HNSW embedding index as (schema, index) pairs."""
+    rows = op.get_bind().execute(sa.text("""
+        SELECT schemaname, indexname
+        FROM pg_indexes
+        WHERE tablename = 'memories'
+        AND indexdef LIKE '%USING hnsw%'
+        ORDER BY schemaname
+    """))
+    return [(row.schemaname, row.indexname) for row in rows]
+
+
+def _convert(schema: str, index: str, column_type: str, opclass: str) -> None:
+    """Retype a tenant's embedding column and rebuild its HNSW index."""
+    bind = op.get_bind()
+    count = bind.execute(
+        sa.text(f'SELECT COUNT(*) FROM "{schema}".memories WHERE embedding IS NOT NULL')  # noqa: S608
+    ).scalar_one()
+    params = _hnsw_params(count)
+
+    op.execute(f'DROP INDEX "{schema}"."{index}"')
+    op.execute(f"""
+        ALTER TABLE "{schema}".memories
+        ALTER COLUMN embedding TYPE {column_type}
+        USING embedding::{column_type}
+    """)
+    op.execute(f"""
+        CREATE INDEX "{index}"
+        ON "{schema}".memories USING hnsw (embedding {opclass})
+        WITH (m = {params["m"]}, ef_construction = {params["ef_construction"]})
+    """)
+
+
+def upgrade() -> None:
+    """Halve embedding storage and scan bandwidth by storing FP16 vectors."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+
+    version = op.get_bind().execute(
+        sa.text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+    ).scalar_one()
+    if tuple(int(part) for part in version.split(".")) < MIN_PGVECTOR_VERSION:
+        raise RuntimeError(
+            f"pgvector {version} does not support halfvec; "
+            "run ALTER EXTENSION vector UPDATE first"
+        )
+
+    op.execute("SET LOCAL maintenance_work_mem = '2GB'")
+
+    for schema, index in _embedding_indexes():
+        _convert(schema, index, "halfvec(768)", "halfvec_cosine_ops")
+
+
+def downgrade() -> None:
+    """Restore full-precision vector embeddings."""
+    op.execute("SET LOCAL maintenance_work_mem = '2GB'")
+
+    for schema, index in _embedding_indexes():
+        _convert(schema, index, "vector(768)", "vector_cosine_ops")
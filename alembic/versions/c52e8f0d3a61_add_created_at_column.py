@@ -0,0 +1,117 @@
+"""Add created_at column
+
+Revision ID: c52e8f0d3a61
+Revises: b7e4d2a91c05
+Create Date: 2026-10-16 10:41:09.682314
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c52e8f0d3a61'
+down_revision: str | None = 'b7e4d2a91c05'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Rows backfilled per UPDATE - small enough to keep locks and WAL bursts short
+BATCH_SIZE = 10_000
+
+
+def _tenant_schemas() -> list[str]:
+    """Find every schema that has a memories table."""
+    rows = op.get_bind().execute(sa.text("""
+        SELECT table_schema
+        FROM information_schema.tables
+        WHERE table_name = 'memories'
+        ORDER BY table_schema
+    """))
+    return [row.table_schema for row in rows]
+
+
+def _created_at_indexes(schema: str) -> list[str]:
+    """Find the created_at index(es) on a tenant's memories table."""
+    rows = op.get_bind().execute(
+        sa.text("""
+            SELECT indexname
+            FROM pg_indexes
+            WHERE schemaname = :schema
+            AND tablename = 'memories'
+            AND indexname LIKE '%created_at'
+        """),
+        {"schema": schema},
+    )
+    return [row.indexname for row in rows]
+
+
+def _backfill(schema: str) -> None:
+    """Copy metadata->>'created_at' into the column in keyset-paginated batches.
+
+    Runs in autocommit mode so each batch commits on its own instead of
+    holding row locks on the whole table until the migration finishes.
+    """
+    bind = op.get_bind()
+    last_id = 0
+    with op.get_context().autocommit_block():
+        while True:
+            upper = bind.execute(
+                sa.text(f"""
+                    SELECT MAX(id) FROM (
+                        SELECT id FROM "{schema}".memories
+                        WHERE id > :last_id
+                        ORDER BY id
+                        LIMIT :batch
+                    ) batch
+                """),  # noqa: S608
+                {"last_id": last_id, "batch": BATCH_SIZE},
+            ).scalar()
+            if upper is None:
+                break
+
+            bind.execute(
+                sa.text(f"""
+                    UPDATE "{schema}".memories
+                    SET created_at = (metadata->>'created_at')::timestamptz
+                    WHERE id > :last_id AND id <= :upper
+                    AND metadata ? 'created_at'
+                """),  # noqa: S608
+                {"last_id": last_id, "upper": upper},
+            )
+            last_id = upper
+
+
+def upgrade() -> None:
+    """Move created_at out of JSONB into an indexed timestamptz column."""
+    for schema in _tenant_schemas():
+        op.execute(f"""
+            ALTER TABLE "{schema}".memories
+            ADD COLUMN IF NOT EXISTS created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        """)
+
+        _backfill(schema)
+
+        for index in _created_at_indexes(schema):
+            op.execute(f'DROP INDEX "{schema}"."{index}"')
+
+        # Covers the recent-memories query: active rows, newest first
+        op.execute(f"""
+            CREATE INDEX idx_memories_created_at
+            ON "{schema}".memories (created_at DESC)
+            WHERE NOT forgotten
+        """)
+
+
+def downgrade() -> None:
+    """Return to the JSONB functional index."""
+    for schema in _tenant_schemas():
+        for index in _created_at_indexes(schema):
+            op.execute(f'DROP INDEX "{schema}"."{index}"')
+
+        op.execute(f'ALTER TABLE "{schema}".memories DROP COLUMN created_at')
+
+        op.execute(f"""
+            CREATE INDEX idx_memories_created_at
+            ON "{schema}".memories ((metadata->>'created_at'))
+        """)
@@ -0,0 +1,59 @@
+"""Add pre-filter indexes for filtered vector search
+
+Revision ID: d81a6b4c29f7
+Revises: c52e8f0d3a61
+Create Date: 2026-10-16 11:20:51.240977
+
+Filtered ANN queries need cheap btree/GIN paths for their predicates, or
+pgvector's cost model falls back to a sequential scan that computes the
+distance for every row. Queries should keep the index-friendly shape:
+
+    WHERE <selective predicates>
+    ORDER BY embedding <=> $1
+    LIMIT k
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81a6b4c29f7'
+down_revision: str | None = 'c52e8f0d3a61'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def _tenant_schemas() -> list[str]:
+    """Find every schema that has a memories table."""
+    rows = op.get_bind().execute(sa.text("""
+        SELECT table_schema
+        FROM information_schema.tables
+        WHERE table_name = 'memories'
+        ORDER BY table_schema
+    """))
+    return [row.table_schema for row in rows]
+
+
+def upgrade() -> None:
+    """Add btree and GIN indexes the planner can use to pre-filter kNN."""
+    for schema in _tenant_schemas():
+        # Active-memory + time-window predicates
+        op.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_memories_active_created
+            ON "{schema}".memories (forgotten, created_at DESC)
+        """)
+
+        # Containment filters on any metadata key (metadata @> '{{...}}')
+        op.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_memories_metadata_path
+            ON "{schema}".memories USING gin (metadata jsonb_path_ops)
+        """)
+
+
+def downgrade() -> None:
+    """Drop the pre-filter indexes."""
+    for schema in _tenant_schemas():
+        op.execute(f'DROP INDEX IF EXISTS "{schema}".idx_memories_metadata_path')
+        op.execute(f'DROP INDEX IF EXISTS "{schema}".idx_memories_active_created')
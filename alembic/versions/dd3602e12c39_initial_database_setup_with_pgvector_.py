@@ -16,87 +16,107 @@ branch_labels: str | Sequence[str] | None = None
 depends_on: str | Sequence[str] | None = None
 
 
+TENANTS = ["claude", "alpha"]
+
+
+def _table_ddl(tenant: str) -> list[str]:
+    """Schema and table statements for one tenant."""
+    return [
+        f"CREATE SCHEMA IF NOT EXISTS {tenant}",
+        # Memories table
+        f"""
+        CREATE TABLE IF NOT EXISTS {tenant}.memories (
+            id SERIAL PRIMARY KEY,
+            content TEXT NOT NULL,
+            content_tsv tsvector GENERATED ALWAYS AS (to_tsvector('english', content)) STORED,
+            embedding vector(768),
+            forgotten BOOLEAN DEFAULT false,
+            metadata JSONB DEFAULT '{{}}',
+
+            CONSTRAINT content_not_empty CHECK (char_length(content) > 0),
+            CONSTRAINT content_max_length CHECK (char_length(content) <= 7500)
+        )
+        """,
+        # API keys table for tenant authentication
+        f"""
+        CREATE TABLE IF NOT EXISTS {tenant}.api_keys (
+            id SERIAL PRIMARY KEY,
+            key_hash VARCHAR(255) NOT NULL UNIQUE,
+            description TEXT,
+            created_at TIMESTAMPTZ DEFAULT NOW(),
+            last_used TIMESTAMPTZ,
+            active BOOLEAN DEFAULT true
+        )
+        """,
+    ]
+
+
+def _index_ddl(tenant: str) -> list[str]:
+    """Index statements for one tenant.
+
+    CONCURRENTLY keeps re-runs against populated tenants from blocking writes.
+    """
+    return [
+        # Full-text search on content
+        f"""
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_{tenant}_memories_content_tsv
+        ON {tenant}.memories USING gin (content_tsv)
+        """,
+        # Vector similarity search (HNSW keeps recall stable under inserts,
+        # unlike IVFFlat which needs periodic REINDEX as data drifts)
+        f"""
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_{tenant}_memories_embedding
+        ON {tenant}.memories USING hnsw (embedding vector_cosine_ops)
+        WITH (m = 16, ef_construction = 64)
+        """,
+        # Active memories filter
+        f"""
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_{tenant}_memories_forgotten
+        ON {tenant}.memories (forgotten)
+        WHERE NOT forgotten
+        """,
+        # Tag searches in metadata
+        f"""
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_{tenant}_memories_metadata_tags
+        ON {tenant}.memories USING gin ((metadata->'tags'))
+        """,
+        # Entity searches in metadata
+        f"""
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_{tenant}_memories_metadata_entities
+        ON {tenant}.memories USING gin ((metadata->'entities'))
+        """,
+        # Recent memories queries
+        f"""
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_{tenant}_memories_created_at
+        ON {tenant}.memories ((metadata->>'created_at'))
+        """,
+    ]
+
+
 def upgrade() -> None:
     """Create initial database structure with pgvector extension and tenant schemas."""
     # Create pgvector extension in public schema
     op.execute("CREATE EXTENSION IF NOT EXISTS vector")
 
-    # Create default tenants - claude and alpha
-    for tenant in ["claude", "alpha"]:
-        # Create schema
-        op.execute(f"CREATE SCHEMA IF NOT EXISTS {tenant}")
-
-        # Create memories table in tenant schema
-        op.execute(f"""
-            CREATE TABLE IF NOT EXISTS {tenant}.memories (
-                id SERIAL PRIMARY KEY,
-                content TEXT NOT NULL,
-                content_tsv tsvector GENERATED ALWAYS AS (to_tsvector('english', content)) STORED,
-                embedding vector(768),
-                forgotten BOOLEAN DEFAULT false,
-                metadata JSONB DEFAULT '{{}}',
-
-                CONSTRAINT content_not_empty CHECK (char_length(content) > 0),
-                CONSTRAINT content_max_length CHECK (char_length(content) <= 7500)
-            )
-        """)
-
-        # Create api_keys table for tenant authentication
-        op.execute(f"""
-            CREATE TABLE IF NOT EXISTS {tenant}.api_keys (
-                id SERIAL PRIMARY KEY,
-                key_hash VARCHAR(255) NOT NULL UNIQUE,
-                description TEXT,
-                created_at TIMESTAMPTZ DEFAULT NOW(),
-                last_used TIMESTAMPTZ,
-                active BOOLEAN DEFAULT true
-            )
-        """)
-
-        # Create indexes for performance
-        # Full-text search on content
-        op.execute(f"""
-            CREATE INDEX IF NOT EXISTS idx_{tenant}_memories_content_tsv
-            ON {tenant}.memories USING gin (content_tsv)
-        """)
-
-        # Vector similarity search
-        op.execute(f"""
-            CREATE INDEX IF NOT EXISTS idx_{tenant}_memories_embedding
-            ON {tenant}.memories USING ivfflat (embedding vector_cosine_ops)
-            WITH (lists = 100)
-        """)
+    # One round-trip per tenant for its schema and tables. A DO block keeps
+    # the script a single statement, which prepared-statement drivers need.
+    for tenant in TENANTS:
+        op.execute(f"DO $$ BEGIN {';'.join(_table_ddl(tenant))}; END $$")
 
-        # Active memories filter
-        op.execute(f"""
-            CREATE INDEX IF NOT EXISTS idx_{tenant}_memories_forgotten
-            ON {tenant}.memories (forgotten)
-            WHERE NOT forgotten
-        """)
-
-        # Tag searches in metadata
-        op.execute(f"""
-            CREATE INDEX IF NOT EXISTS idx_{tenant}_memories_metadata_tags
-            ON {tenant}.memories USING gin ((metadata->'tags'))
-        """)
-
-        # Entity searches in metadata
-        op.execute(f"""
-            CREATE INDEX IF NOT EXISTS idx_{tenant}_memories_metadata_entities
-            ON {tenant}.memories USING gin ((metadata->'entities'))
-        """)
-
-        # Recent memories queries
-        op.execute(f"""
-            CREATE INDEX IF NOT EXISTS idx_{tenant}_memories_created_at
-            ON {tenant}.memories ((metadata->>'created_at'))
-        """)
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        # HNSW builds are much faster when the graph fits in maintenance memory
+        op.execute("SET maintenance_work_mem = '2GB'")
+        for tenant in TENANTS:
+            for ddl in _index_ddl(tenant):
+                op.execute(ddl)
+        op.execute("RESET maintenance_work_mem")
 
 
 def downgrade() -> None:
     """Drop tenant schemas and pgvector extension."""
     # Drop tenant schemas (CASCADE will drop all tables and indexes)
-    for tenant in ["claude", "alpha"]:
+    for tenant in TENANTS:
         op.execute(f"DROP SCHEMA IF EXISTS {tenant} CASCADE")
 
     # Drop pgvector extension
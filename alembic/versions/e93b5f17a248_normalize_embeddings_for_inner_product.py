@@ -0,0 +1,82 @@
+"""Normalize embeddings and index by inner product
+
+Revision ID: e93b5f17a248
+Revises: d81a6b4c29f7
+Create Date: 2026-10-16 12:04:11.583206
+
+For unit-length vectors cosine similarity equals the inner product, so the
+HNSW index can use halfvec_ip_ops and skip the two norm reductions cosine
+distance pays on every comparison. Queries must then order by
+embedding <#> $1, which is the *negative* inner product (similarity is
+-(embedding <#> $1)).
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e93b5f17a248'
+down_revision: str | None = 'd81a6b4c29f7'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def _hnsw_params(vector_count: int) -> dict[str, int]:
+    """Frozen copy of configure_hnsw_params's size tiers at this revision."""
+    if vector_count < 100_000:
+        return {"m": 16, "ef_construction": 64, "ef_search": 40}
+    if vector_count < 1_000_000:
+        return {"m": 24, "ef_construction": 128, "ef_search": 100}
+    return {"m": 32, "ef_construction": 256, "ef_search": 200}
+
+
+def _embedding_indexes() -> list[tuple[str, str]]:
+    """Find every tenant's HNSW embedding index as (schema, index) pairs."""
+    rows = op.get_bind().execute(sa.text("""
+        SELECT schemaname, indexname
+        FROM pg_indexes
+        WHERE tablename = 'memories'
+        AND indexdef LIKE '%USING hnsw%'
+        ORDER BY schemaname
+    """))
+    return [(row.schemaname, row.indexname) for row in rows]
+
+
+def _rebuild(schema: str, index: str, opclass: str) -> None:
+    """Rebuild a tenant's HNSW index with the given operator class."""
+    count = op.get_bind().execute(
+        sa.text(f'SELECT COUNT(*) FROM "{schema}".memories WHERE embedding IS NOT NULL')  # noqa: S608
+    ).scalar_one()
+    params = _hnsw_params(count)
+
+    op.execute(f"""
+        CREATE INDEX "{index}"
+        ON "{schema}".memories USING hnsw (embedding {opclass})
+        WITH (m = {params["m"]}, ef_construction = {params["ef_construction"]})
+    """)
+
+
+def upgrade() -> None:
+    """Store unit-length embeddings and switch the index to inner product."""
+    op.execute("SET LOCAL maintenance_work_mem = '2GB'")
+
+    for schema, index in _embedding_indexes():
+        # Drop first so the rewrite doesn't pay for index maintenance
+        op.execute(f'DROP INDEX "{schema}"."{index}"')
+        op.execute(f"""
+            UPDATE "{schema}".memories
+            SET embedding = l2_normalize(embedding)
+            WHERE embedding IS NOT NULL
+        """)  # noqa: S608
+        _rebuild(schema, index, "halfvec_ip_ops")
+
+
+def downgrade() -> None:
+    """Index by cosine distance again (vectors stay normalized)."""
+    op.execute("SET LOCAL maintenance_work_mem = '2GB'")
+
+    for schema, index in _embedding_indexes():
+        op.execute(f'DROP INDEX "{schema}"."{index}"')
+        _rebuild(schema, index, "halfvec_cosine_ops")
@@ -0,0 +1,66 @@
+"""Replace content_tsv column with an expression index
+
+Revision ID: f4c7a0d85e12
+Revises: e93b5f17a248
+Create Date: 2026-10-16 12:41:37.906154
+
+The stored generated tsvector made every INSERT run to_tsvector() and
+carried a serialized tsvector in every row, whether or not the memory was
+ever found by full-text search. A partial GIN expression index gives the
+same @@ lookups without materializing anything per row.
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c7a0d85e12'
+down_revision: str | None = 'e93b5f17a248'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def _tenant_schemas() -> list[str]:
+    """Find every schema that has a memories table."""
+    rows = op.get_bind().execute(sa.text("""
+        SELECT table_schema
+        FROM information_schema.tables
+        WHERE table_name = 'memories'
+        ORDER BY table_schema
+    """))
+    return [row.table_schema for row in rows]
+
+
+def upgrade() -> None:
+    """Drop the generated tsvector column and index the expression instead."""
+    schemas = _tenant_schemas()
+
+    # Dropping the column also drops its GIN index
+    for schema in schemas:
+        op.execute(f'ALTER TABLE "{schema}".memories DROP COLUMN IF EXISTS content_tsv')
+
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        for schema in schemas:
+            op.execute(f"""
+                CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_memories_content_fts
+                ON "{schema}".memories USING gin (to_tsvector('english', content))
+                WHERE NOT forgotten
+            """)
+
+
+def downgrade() -> None:
+    """Restore the generated tsvector column and its GIN index."""
+    for schema in _tenant_schemas():
+        op.execute(f'DROP INDEX IF EXISTS "{schema}".idx_memories_content_fts')
+        op.execute(f"""
+            ALTER TABLE "{schema}".memories
+            ADD COLUMN IF NOT EXISTS content_tsv tsvector
+            GENERATED ALWAYS AS (to_tsvector('english', content)) STORED
+        """)
+        op.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_memories_content_tsv
+            ON "{schema}".memories USING gin (content_tsv)
+        """)
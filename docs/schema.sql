@@ -8,28 +8,43 @@ CREATE EXTENSION IF NOT EXISTS vector;
 CREATE SCHEMA IF NOT EXISTS claude;
 CREATE SCHEMA IF NOT EXISTS alpha;
 
--- Set default schema
-SET search_path TO claude;
-
--- Core memories table
-CREATE TABLE memories (
-    id SERIAL PRIMARY KEY,
+-- All tenants' memories share one table, partitioned by tenant
+CREATE TABLE public.memories_by_tenant (
+    id SERIAL,
+    tenant TEXT NOT NULL,
     content TEXT NOT NULL,
-    embedding vector(768),  -- nomic-embed-text produces 768-dim vectors
-    forgotten BOOLEAN DEFAULT false,
+    embedding halfvec(768),  -- nomic-embed-text produces 768-dim vectors (stored FP16)
+    forgotten BOOLEAN NOT NULL DEFAULT false,
     metadata JSONB DEFAULT '{}',
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     
+    PRIMARY KEY (id, tenant, forgotten),
+
     -- Constraints
     CONSTRAINT content_not_empty CHECK (char_length(content) > 0),
     CONSTRAINT content_max_length CHECK (char_length(content) <= 7500)
-);
+) PARTITION BY LIST (tenant);
+
+-- Set default schema
+SET search_path TO claude;
+
+-- Each tenant's partition lives in its own schema as "memories"
+CREATE TABLE memories PARTITION OF public.memories_by_tenant FOR VALUES IN ('claude')
+    PARTITION BY LIST (forgotten);
+ALTER TABLE memories ALTER COLUMN tenant SET DEFAULT 'claude';
+
+-- Forgotten memories live apart, so "WHERE NOT forgotten" prunes to the
+-- active partition, the only one with search indexes
+CREATE TABLE memories_active PARTITION OF memories FOR VALUES IN (false);
+CREATE TABLE memories_forgotten PARTITION OF memories FOR VALUES IN (true);
 
--- Indexes for performance
-CREATE INDEX idx_memories_embedding ON memories USING ivfflat (embedding vector_cosine_ops);
-CREATE INDEX idx_memories_forgotten ON memories (forgotten) WHERE NOT forgotten;
-CREATE INDEX idx_memories_metadata_tags ON memories USING gin ((metadata->'tags'));
-CREATE INDEX idx_memories_metadata_entities ON memories USING gin ((metadata->'entities'));
-CREATE INDEX idx_memories_created_at ON memories ((metadata->>'created_at'));
+-- Indexes for performance (active partition only)
+CREATE INDEX idx_memories_embedding ON memories_active USING hnsw (embedding halfvec_ip_ops) WITH (m = 16, ef_construction = 64);
+CREATE INDEX idx_memories_content_fts ON memories_active USING gin (to_tsvector('english', content));
+CREATE INDEX idx_memories_metadata_tags ON memories_active USING gin ((metadata->'tags'));
+CREATE INDEX idx_memories_metadata_entities ON memories_active USING gin ((metadata->'entities'));
+CREATE INDEX idx_memories_created_at ON memories_active (created_at DESC);
+CREATE INDEX idx_memories_metadata_path ON memories_active USING gin (metadata jsonb_path_ops);
 
 -- Example queries that work with this schema:
 
@@ -38,12 +53,18 @@ CREATE INDEX idx_memories_created_at ON memories ((metadata->>'created_at'));
 -- VALUES ($1, $2, $3::jsonb);
 
 -- Search by similarity (0.7-0.9 range for "splash")
--- SELECT id, content, metadata, 1 - (embedding <=> $1) as similarity
--- FROM memories 
--- WHERE NOT forgotten
--- AND embedding <=> $1 < 0.3  -- (1 - 0.7 = 0.3)
--- AND embedding <=> $1 > 0.1  -- (1 - 0.9 = 0.1)
--- ORDER BY embedding <=> $1
+-- Embeddings are stored L2-normalized, so the inner product is the cosine
+-- similarity; <#> returns the negative inner product.
+-- SELECT id, content, metadata, similarity
+-- FROM (
+--     SELECT id, content, metadata, -(embedding <#> $1) as similarity
+--     FROM memories
+--     WHERE NOT forgotten
+--     ORDER BY embedding <#> $1
+--     LIMIT 40
+-- ) nearest
+-- WHERE similarity > 0.7 AND similarity < 0.9
+-- ORDER BY similarity DESC
 -- LIMIT 3;
 
 -- Search by tags
@@ -53,7 +74,7 @@ CREATE INDEX idx_memories_created_at ON memories ((metadata->>'created_at'));
 
 -- Get recent memories
 -- SELECT * FROM memories 
--- WHERE (metadata->>'created_at')::timestamptz > $1
+-- WHERE created_at > $1
 -- AND NOT forgotten
--- ORDER BY (metadata->>'created_at')::timestamptz DESC
+-- ORDER BY created_at DESC
 -- LIMIT 10;
\ No newline at end of file
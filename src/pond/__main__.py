@@ -2,8 +2,6 @@
 
 import os
 
-import uvicorn
-
 from pond.config import settings
 
 
@@ -12,6 +10,9 @@ def main():
     import logging
     import sys
 
+    # Imported here so `import pond.__main__` stays cheap (e.g. for tooling)
+    import uvicorn
+
     # Log which port configuration is being used
     port_source = "default (19100)"
     if "PORT" in os.environ:
@@ -33,6 +34,14 @@ def main():
             port=settings.port,
             reload=settings.debug,
             log_level=settings.log_level.lower() if settings.debug else "critical",
+            # uvicorn[standard] ships uvloop and httptools; "auto" picks them
+            # wherever they install and falls back cleanly where they don't
+            # (uvloop has no Windows build)
+            loop="auto",
+            http="auto",
+            lifespan="on",
+            # PondMiddleware already logs every request
+            access_log=False,
         )
     except SystemExit:
         # Clean exit without additional messages
@@ -19,5 +19,5 @@ async def get_repository(
 
 
 async def get_request_id(request: Request) -> str:
-    """Get request ID from request state."""
-    return getattr(request.state, "request_id", "unknown")
+    """Get request ID from request state (always set by PondMiddleware)."""
+    return request.state.request_id
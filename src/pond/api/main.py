@@ -1,37 +1,56 @@
 """Main FastAPI application."""
 
+import asyncio
+import contextlib
 from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Any
 
+import orjson
 import structlog
-from fastapi import FastAPI
-from fastapi.responses import FileResponse, Response
+from fastapi import FastAPI, Request, status
+from fastapi.responses import FileResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from prometheus_client import REGISTRY, generate_latest
-from prometheus_fastapi_instrumentator import Instrumentator
 
+from pond.config import settings
 from pond.domain import MemoryRepository
 from pond.infrastructure.auth import APIKeyManager
 from pond.infrastructure.database import DatabasePool
 from pond.startup_check import check_configuration, run_startup_checks
+from pond.utils.logbuffer import log_buffer, logger_factory
 
-from .middleware import (
-    AuthenticationMiddleware,
-    ErrorHandlingMiddleware,
-    LoggingMiddleware,
-    RequestIDMiddleware,
-)
+from .middleware import INTERNAL_ERROR_BODY, PondMiddleware, add_request_id
+
+
+def _dumps(obj: Any, **kwargs: Any) -> str:
+    """orjson-backed serializer for structlog's JSONRenderer."""
+    return orjson.dumps(obj, default=kwargs.get("default")).decode()
+
+
+# LOG_FORMAT=json (the default) for machines, anything else for a console
+if settings.log_format == "json":
+    renderers = [
+        structlog.processors.TimeStamper(fmt="iso", utc=True),
+        structlog.processors.format_exc_info,
+        structlog.processors.JSONRenderer(serializer=_dumps),
+    ]
+else:
+    renderers = [structlog.dev.ConsoleRenderer(colors=True)]
 
 # Configure structlog for our app only
 structlog.configure(
     processors=[
-        structlog.contextvars.merge_contextvars,
+        add_request_id,
         structlog.processors.add_log_level,
         structlog.processors.StackInfoRenderer(),
-        structlog.dev.ConsoleRenderer(colors=True),
+        *renderers,
     ],
+    # Calls below LOG_LEVEL are no-op methods: no event dict, no processors
+    wrapper_class=structlog.make_filtering_bound_logger(settings.log_level),
     context_class=dict,
-    logger_factory=structlog.PrintLoggerFactory(),
+    # Lines are queued and written by a background task once the app starts
+    logger_factory=logger_factory,
     cache_logger_on_first_use=True,
 )
 
@@ -51,6 +70,9 @@ async def lifespan(app: FastAPI):
     # Run legacy configuration check
     check_configuration()
 
+    # Write logs from a background task from here on
+    log_buffer.start()
+
     # Initialize database pool
     logger.info("initializing_database_pool")
     app.state.db_pool = DatabasePool()
@@ -65,7 +87,12 @@ async def lifespan(app: FastAPI):
     app.state.memory_repository = MemoryRepository(app.state.db_pool)
     logger.info(
         "memory_repository_ready",
-        spacy_model_loaded=bool(app.state.memory_repository._nlp),
+        spacy_model_loaded=app.state.memory_repository.nlp_loaded,
+    )
+
+    # Stores only increment the memory count gauge; recount periodically
+    count_refresh = asyncio.create_task(
+        app.state.memory_repository.refresh_memory_counts_forever()
     )
 
     # API key authentication is always required
@@ -74,8 +101,13 @@ async def lifespan(app: FastAPI):
     yield
 
     # Cleanup
+    count_refresh.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await count_refresh
+    app.state.memory_repository.close()
     logger.info("closing_database_pool")
     await app.state.db_pool.close()
+    await log_buffer.stop()
 
 
 # Create v1 API app
@@ -93,6 +125,43 @@ from .routes import health, memories  # noqa: E402
 api_v1.include_router(health.router)
 api_v1.include_router(memories.router)
 
+
+async def validation_error_handler(request: Request, exc: ValueError) -> JSONResponse:
+    """Turn validation errors raised by any v1 route into a 400."""
+    route = request.scope.get("route")
+    logger.warning(
+        "validation_error",
+        route=route.path if route else request.url.path,
+        tenant=request.state.tenant,
+        error=str(exc),
+    )
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={"detail": str(exc)},
+    )
+
+
+async def internal_error_handler(request: Request, exc: Exception) -> Response:
+    """Answer any other route error with a 500 carrying the request ID.
+
+    Starlette re-raises the exception afterwards; PondMiddleware logs it.
+    """
+    return Response(
+        content=INTERNAL_ERROR_BODY % request.state.request_id.encode("latin-1"),
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        media_type="application/json",
+    )
+
+
+def register_exception_handlers(app: FastAPI) -> None:
+    """Install the 400/500 route error handlers on an API app."""
+    app.add_exception_handler(ValueError, validation_error_handler)
+    app.add_exception_handler(Exception, internal_error_handler)
+
+
+register_exception_handlers(api_v1)
+
+
 # Create main app and mount v1
 app = FastAPI(
     title="Pond",
@@ -109,26 +178,7 @@ api_v1.state = app.state
 app.mount("/api/v1", api_v1)
 
 # Add middleware to main app
-app.add_middleware(AuthenticationMiddleware)
-app.add_middleware(ErrorHandlingMiddleware)
-app.add_middleware(LoggingMiddleware)
-app.add_middleware(RequestIDMiddleware)
-
-# Add Prometheus instrumentation for automatic HTTP metrics
-instrumentator = Instrumentator(
-    should_group_status_codes=True,
-    should_ignore_untemplated=True,
-    should_respect_env_var=True,  # Respects ENABLE_METRICS env var
-    should_instrument_requests_inprogress=True,
-    excluded_handlers=["/metrics"],  # Don't track metrics endpoint itself
-    env_var_name="ENABLE_METRICS",
-    inprogress_name="pond_http_requests_inprogress",
-    inprogress_labels=True,
-)
-
-# Instrument the app for automatic HTTP metrics
-instrumentator.instrument(app)
-
+app.add_middleware(PondMiddleware)
 
 # Add metrics endpoint manually to ensure it's accessible
 @app.get("/metrics", include_in_schema=False)
@@ -1,160 +1,273 @@
 """API middleware for auth, request tracking, and error handling."""
 
+import re
 import time
-import uuid
-from collections.abc import Callable
-from typing import ClassVar
+from contextvars import ContextVar
+from typing import Any
 
 import structlog
-from fastapi import Request, Response, status
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import status
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from pond.config import settings
 from pond.infrastructure.auth import APIKeyManager
+from pond.metrics import http_request_duration, http_requests
+from pond.utils.fastuuid import new_request_id
 
 logger = structlog.get_logger()
 
+HEALTH_PATH = "/api/v1/health"
+METRICS_PATH = "/metrics"
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
-    """Add request ID to all requests and responses."""
-
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Process request and add request ID."""
-        request_id = str(uuid.uuid4())
-
-        # Store in request state for other middleware/handlers
-        request.state.request_id = request_id
-
-        # Add to structlog context
-        structlog.contextvars.bind_contextvars(request_id=request_id)
+# Paths that don't require authentication
+PUBLIC_PATHS = frozenset({
+    "/api/v1/docs",
+    "/api/v1/openapi.json",
+    "/api/v1/redoc",
+    "/favicon.ico",  # Browser auto-requests this
+    METRICS_PATH,  # Prometheus endpoint must be public
+    "/",  # Secret visualizer Easter egg
+})
+
+# Health probes and metrics scrapes: not logged, timed, or counted
+QUIET_PATHS = frozenset({HEALTH_PATH, METRICS_PATH})
+
+# Caller-supplied request IDs are reused only if short and plain
+MAX_REQUEST_ID_LENGTH = 255
+_invalid_request_id = re.compile(r"[^\w\-]", re.ASCII).search
+
+
+# The current request's ID, read by add_request_id for every log line
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+
+def add_request_id(
+    logger: Any, method_name: str, event_dict: dict[str, Any]
+) -> dict[str, Any]:
+    """Structlog processor that tags log lines with the current request ID.
+
+    One ContextVar read, instead of merge_contextvars walking the whole
+    context on every log call.
+    """
+    request_id = request_id_var.get()
+    if request_id is not None:
+        event_dict.setdefault("request_id", request_id)
+    return event_dict
+
+
+def _static_json(status_code: int, body: bytes) -> ASGIApp:
+    """ASGI app sending a fixed JSON body, encoded once at import."""
+    headers = (
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode("latin-1")),
+    )
+
+    async def respond(scope: Scope, receive: Receive, send: Send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": list(headers),
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    return respond
+
+
+_unauthorized = _static_json(status.HTTP_401_UNAUTHORIZED, b'{"error":"Unauthorized"}')
+
+# Request IDs are [A-Za-z0-9_-] only, so they need no JSON escaping.
+# Shared with the v1 app's exception handler, so every 500 looks the same.
+INTERNAL_ERROR_BODY = b'{"error":"An internal error occurred","request_id":"%b"}'
+
+
+def _get_header(scope: Scope, name: bytes) -> str | None:
+    """Find a request header by its lowercase name without building Headers."""
+    for key, value in scope["headers"]:
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return None
+
+
+class PondMiddleware:
+    """Request ID, logging, error handling, and authentication in one layer.
+
+    This is a pure ASGI middleware rather than a stack of BaseHTTPMiddleware
+    classes, so each request pays for one extra coroutine frame instead of
+    four, and responses are streamed through untouched.
+
+    Per request, in order:
+    1. Assign a request ID (state, structlog context, X-Request-ID header),
+       reusing a valid inbound X-Request-ID
+    2. Log the request once it completes (except quiet paths - too noisy)
+    3. Authenticate the API key and store the tenant in request state
+    4. Turn unhandled exceptions into a consistent 500 response
+    5. Log the response status and duration
+    6. Record HTTP metrics (if ENABLE_METRICS is set)
+
+    Health probes and metrics scrapes (QUIET_PATHS) skip steps 2, 5 and 6
+    entirely - they are the highest-frequency and least interesting traffic.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.record_metrics = settings.enable_metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process one request through all of Pond's cross-cutting concerns."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Reuse an upstream proxy's ID so logs correlate across hops
+        request_id = _get_header(scope, b"x-request-id")
+        if (
+            not request_id
+            or len(request_id) > MAX_REQUEST_ID_LENGTH
+            or _invalid_request_id(request_id)
+        ):
+            request_id = new_request_id()
+
+        # Store in request state for handlers (request.state.request_id)
+        state = scope.setdefault("state", {})
+        state["request_id"] = request_id
+        # Initialize tenant as None (for public endpoints)
+        state["tenant"] = None
+
+        # Tag every log line emitted while handling this request
+        request_id_token = request_id_var.set(request_id)
+
+        request_id_header = request_id.encode("latin-1")
+        path = scope["path"]
+        instrument = path not in QUIET_PATHS
+        start_ns = time.perf_counter_ns() if instrument else 0
+        response_started = False
+        response_complete = False
+        status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal response_started, response_complete, status_code
+            if message["type"] == "http.response.body":
+                response_complete = not message.get("more_body", False)
+            elif message["type"] == "http.response.start":
+                response_started = True
+                status_code = message["status"]
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"x-request-id", request_id_header),
+                ]
+            await send(message)
 
         try:
-            response = await call_next(request)
-            response.headers["X-Request-ID"] = request_id
-            return response
+            try:
+                rejection = await self._authenticate(scope)
+                if rejection is not None:
+                    await rejection(scope, receive, send_with_request_id)
+                else:
+                    await self.app(scope, receive, send_with_request_id)
+            except Exception as exc:
+                # Log the full exception internally (routes set scope["route"])
+                route = scope.get("route")
+                logger.exception(
+                    "unhandled_exception",
+                    route=route.path if route else path,
+                    exc_type=type(exc).__name__,
+                    exc_message=str(exc),
+                )
+
+                if not response_started:
+                    # Return user-friendly error
+                    response = _static_json(
+                        status.HTTP_500_INTERNAL_SERVER_ERROR,
+                        INTERNAL_ERROR_BODY % request_id_header,
+                    )
+                    await response(scope, receive, send_with_request_id)
+                elif not response_complete:
+                    # Too late for a clean error response once the body started
+                    raise
+                # Otherwise an exception handler has already answered; Starlette
+                # re-raises afterwards only so the server can log it, done above
+
+            if instrument:
+                duration_ns = time.perf_counter_ns() - start_ns
+
+                # One line per request, emitted after the response is sent
+                client = scope.get("client")
+                logger.info(
+                    "request_completed",
+                    method=scope["method"],
+                    path=path,
+                    client=client[0] if client else None,
+                    status_code=status_code,
+                    duration_ms=duration_ns // 1_000_000,
+                )
+
+                if self.record_metrics:
+                    self._record_metrics(scope, status_code, duration_ns)
         finally:
-            # Clear context after request
-            structlog.contextvars.clear_contextvars()
-
-
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Log all requests and responses."""
-
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Log request details and response status."""
-        start_time = time.time()
-
-        # Skip logging for health checks (too noisy)
-        if request.url.path == "/api/v1/health":
-            return await call_next(request)
-
-        # Log request
-        logger.info(
-            "request_started",
-            method=request.method,
-            path=request.url.path,
-            client=request.client.host if request.client else None,
-        )
-
-        response = await call_next(request)
-
-        # Calculate duration
-        duration_ms = (time.time() - start_time) * 1000
-
-        # Log response
-        logger.info(
-            "request_completed",
-            status_code=response.status_code,
-            duration_ms=round(duration_ms, 2),
-        )
-
-        return response
-
-
-class ErrorHandlingMiddleware(BaseHTTPMiddleware):
-    """Global error handler for consistent error responses."""
-
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Catch exceptions and return consistent error format."""
-        try:
-            return await call_next(request)
-        except Exception as exc:
-            # Get request ID if available
-            request_id = getattr(request.state, "request_id", "unknown")
-
-            # Log the full exception internally
-            logger.exception(
-                "unhandled_exception",
-                exc_type=type(exc).__name__,
-                exc_message=str(exc),
-            )
-
-            # Return user-friendly error
-            return JSONResponse(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                content={
-                    "error": "An internal error occurred",
-                    "request_id": request_id,
-                },
-            )
-
-
-class AuthenticationMiddleware(BaseHTTPMiddleware):
-    """Check API key authentication and extract tenant."""
-
-    # Paths that don't require authentication
-    PUBLIC_PATHS: ClassVar[set[str]] = {
-        "/api/v1/docs",
-        "/api/v1/openapi.json",
-        "/api/v1/redoc",
-        "/favicon.ico",  # Browser auto-requests this
-        "/metrics",  # Prometheus endpoint must be public
-        "/",  # Secret visualizer Easter egg
-    }
-
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Check API key and extract tenant from it."""
-        # Initialize tenant as None (for public endpoints)
-        request.state.tenant = None
+            request_id_var.reset(request_id_token)
+
+    @staticmethod
+    def _record_metrics(scope: Scope, status_code: int, duration_ns: int) -> None:
+        """Count the request and time it against its route template."""
+        method = scope["method"]
+        http_requests.labels(method=method, status=f"{status_code // 100}xx").inc()
+
+        # The router leaves the matched route in scope; unmatched paths are
+        # skipped so arbitrary URLs can't blow up label cardinality
+        route = scope.get("route")
+        if route is not None:
+            http_request_duration.labels(
+                method=method,
+                path_template=scope.get("root_path", "") + route.path,
+            ).observe(duration_ns / 1_000_000_000)
+
+    async def _authenticate(self, scope: Scope) -> ASGIApp | None:
+        """Check the API key and store its tenant in request state.
+
+        Returns:
+            A 401 response to send instead of the app, or None to continue
+        """
+        path = scope["path"]
+
+        # Special handling for health endpoint - optional auth. Checked
+        # first: it's the most frequent path and costs one string compare
+        if path == HEALTH_PATH:
+            provided_key = _get_header(scope, b"x-api-key")
+            if provided_key:
+                # Try to validate the key (a recently seen key needs no await)
+                api_key_manager: APIKeyManager = scope["app"].state.api_key_manager
+                tenant = api_key_manager.cached_tenant(provided_key)
+                if tenant is None:
+                    try:
+                        tenant = await api_key_manager.validate_key(
+                            provided_key, cache_checked=True
+                        )
+                    except ValueError:
+                        # If invalid key, still allow access (just no tenant info)
+                        pass
+                scope["state"]["tenant"] = tenant
+            return None
 
         # Skip auth for public paths and assets
-        if request.url.path in self.PUBLIC_PATHS or request.url.path.startswith("/assets/"):
-            return await call_next(request)
-
-        # Special handling for health endpoint - optional auth
-        if request.url.path == "/api/v1/health":
-            provided_key = request.headers.get("X-API-Key")
-            if provided_key:
-                # Try to validate the key
-                api_key_manager: APIKeyManager = request.app.state.api_key_manager
-                try:
-                    tenant = await api_key_manager.validate_key(provided_key)
-                    request.state.tenant = tenant
-                except ValueError:
-                    # If invalid key, still allow access (just no tenant info)
-                    pass
-            return await call_next(request)
+        if path in PUBLIC_PATHS or path.startswith("/assets/"):
+            return None
 
         # For all other endpoints, API key is required
-        provided_key = request.headers.get("X-API-Key")
-
+        provided_key = _get_header(scope, b"x-api-key")
         if not provided_key:
-            return JSONResponse(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                content={"error": "Unauthorized"},
-            )
-
-        # Validate key and get tenant
-        api_key_manager: APIKeyManager = request.app.state.api_key_manager
-        try:
-            tenant = await api_key_manager.validate_key(provided_key)
-        except ValueError:
-            return JSONResponse(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                content={"error": "Unauthorized"},
-            )
+            return _unauthorized
+
+        # Validate key and get tenant; a recently seen key needs no await
+        api_key_manager: APIKeyManager = scope["app"].state.api_key_manager
+        tenant = api_key_manager.cached_tenant(provided_key)
+        if tenant is None:
+            try:
+                tenant = await api_key_manager.validate_key(
+                    provided_key, cache_checked=True
+                )
+            except ValueError:
+                return _unauthorized
 
         # Store tenant in request state for use by endpoints
-        request.state.tenant = tenant
-
-        return await call_next(request)
+        scope["state"]["tenant"] = tenant
+        return None
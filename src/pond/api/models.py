@@ -1,9 +1,16 @@
 """Pydantic models for API requests and responses."""
 
 from datetime import datetime
-from typing import Any
+from typing import Annotated, Any
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    StringConstraints,
+    TypeAdapter,
+    field_validator,
+)
 
 # Request models
 
@@ -12,7 +19,10 @@ class StoreRequest(BaseModel):
     """Request to store a memory."""
 
     content: str = Field(..., min_length=1, max_length=7500)
-    tags: list[str] = Field(default_factory=list)
+    # Stripped by pydantic-core before clean_tags sees them
+    tags: list[Annotated[str, StringConstraints(strip_whitespace=True)]] = Field(
+        default_factory=list
+    )
 
     @field_validator("content")
     @classmethod
@@ -26,8 +36,14 @@ class StoreRequest(BaseModel):
     @classmethod
     def clean_tags(cls, v: list[str]) -> list[str]:
         """Clean and validate tags."""
-        # Remove empty strings and duplicates
-        return list({tag.strip() for tag in v if tag.strip()})
+        # Remove empty strings and duplicates, keeping the caller's order
+        return list(dict.fromkeys(tag for tag in v if tag))
+
+
+class StoreBatchRequest(BaseModel):
+    """Request to store several memories at once."""
+
+    memories: list[StoreRequest] = Field(..., min_length=1, max_length=100)
 
 
 class SearchRequest(BaseModel):
@@ -36,15 +52,12 @@ class SearchRequest(BaseModel):
     If query is empty or not provided, returns recent memories (same as /init).
     """
 
+    # Stripped by pydantic-core; empty queries are allowed - they return
+    # recent memories
     query: str = Field(default="", max_length=500)
     limit: int = Field(default=10, ge=1, le=100)
 
-    @field_validator("query")
-    @classmethod
-    def validate_query(cls, v: str) -> str:
-        """Clean the query string."""
-        # Empty queries are allowed - they return recent memories
-        return v.strip()
+    model_config = ConfigDict(str_strip_whitespace=True)
 
 
 class RecentRequest(BaseModel):
@@ -69,6 +82,8 @@ class EntityResponse(BaseModel):
     text: str
     type: str
 
+    model_config = ConfigDict(frozen=True)
+
 
 class MemoryResponse(BaseModel):
     """Response containing a memory."""
@@ -80,65 +95,71 @@ class MemoryResponse(BaseModel):
     entities: list[EntityResponse] = Field(default_factory=list)
     actions: list[str] = Field(default_factory=list)
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
-    @classmethod
-    def from_memory(cls, memory: Any) -> "MemoryResponse":
-        """Convert a Memory domain object to response model."""
-        # Extract entities from metadata
-        entities = []
-        if memory.metadata and "entities" in memory.metadata:
-            entities = [
-                EntityResponse(text=e["text"], type=e["type"])
-                for e in memory.metadata["entities"]
-            ]
-
-        # Extract tags and actions from metadata
-        tags = []
-        actions = []
-        if memory.metadata:
-            tags = memory.metadata.get("tags", [])
-            # Actions come as list of dicts with 'lemma' key
-            actions_raw = memory.metadata.get("actions", [])
-            if actions_raw and isinstance(actions_raw[0], dict):
-                actions = [a.get("lemma", str(a)) for a in actions_raw]
-            else:
-                actions = actions_raw
+    @staticmethod
+    def _fields(memory: Any) -> dict[str, Any]:
+        """Pull the response fields out of a Memory domain object."""
+        metadata = memory.metadata or {}
+
+        # Actions come as list of dicts with 'lemma' key
+        actions = metadata.get("actions", [])
+        if actions and isinstance(actions[0], dict):
+            actions = [a.get("lemma", str(a)) for a in actions]
 
         # Get created_at from metadata - it's stored as an ISO string in JSONB
-        created_at_str = memory.metadata.get("created_at") if memory.metadata else None
-        if not created_at_str:
+        created_at = metadata.get("created_at")
+        if not created_at:
             raise ValueError(f"Memory {memory.id} has no created_at timestamp")
-
-        # Parse the ISO string to datetime
-        if isinstance(created_at_str, str):
-            from dateutil.parser import isoparse
-
-            # Use dateutil which returns a standard datetime
-            created_at = isoparse(created_at_str)
-        elif isinstance(created_at_str, datetime):
-            created_at = created_at_str
-        else:
+        if isinstance(created_at, str):
+            created_at = datetime.fromisoformat(created_at)
+        elif not isinstance(created_at, datetime):
             raise ValueError(
-                f"Memory {memory.id} has invalid created_at: {created_at_str!r}"
+                f"Memory {memory.id} has invalid created_at: {created_at!r}"
             )
 
-        return cls(
-            id=memory.id,
-            content=memory.content,
-            created_at=created_at,
-            tags=tags,
-            entities=entities,
-            actions=actions,
+        return {
+            "id": memory.id,
+            "content": memory.content,
+            "created_at": created_at,
+            "tags": metadata.get("tags", []),
+            # Entity dicts are validated into EntityResponse by pydantic-core
+            "entities": metadata.get("entities", []),
+            "actions": actions,
+        }
+
+    @classmethod
+    def from_memory(cls, memory: Any) -> "MemoryResponse":
+        """Convert a Memory domain object to response model."""
+        return cls.model_validate(cls._fields(memory))
+
+    @classmethod
+    def from_memories(cls, memories: list[Any]) -> list["MemoryResponse"]:
+        """Convert many Memory domain objects in one validation pass."""
+        return _memory_list_adapter.validate_python(
+            [cls._fields(memory) for memory in memories]
         )
 
 
+_memory_list_adapter = TypeAdapter(list[MemoryResponse])
+
+
 class StoreResponse(BaseModel):
     """Response after storing a memory."""
 
     id: int
     splash: list[MemoryResponse] = Field(default_factory=list)
 
+    model_config = ConfigDict(frozen=True)
+
+
+class StoreBatchResponse(BaseModel):
+    """Response after storing several memories."""
+
+    ids: list[int]
+
+    model_config = ConfigDict(frozen=True)
+
 
 class SearchResponse(BaseModel):
     """Response for search results."""
@@ -146,6 +167,8 @@ class SearchResponse(BaseModel):
     memories: list[MemoryResponse]
     count: int
 
+    model_config = ConfigDict(frozen=True)
+
 
 class RecentResponse(BaseModel):
     """Response for recent memories."""
@@ -153,6 +176,8 @@ class RecentResponse(BaseModel):
     memories: list[MemoryResponse]
     count: int
 
+    model_config = ConfigDict(frozen=True)
+
 
 class InitResponse(BaseModel):
     """Response for initialization."""
@@ -160,6 +185,8 @@ class InitResponse(BaseModel):
     current_time: datetime
     recent_memories: list[MemoryResponse]
 
+    model_config = ConfigDict(frozen=True)
+
 
 class TenantHealthResponse(BaseModel):
     """Response for tenant-specific health check."""
@@ -173,6 +200,8 @@ class TenantHealthResponse(BaseModel):
     embedding_provider: str
     embedding_healthy: bool
 
+    model_config = ConfigDict(frozen=True)
+
 
 class SystemHealthResponse(BaseModel):
     """Response for system-wide health check."""
@@ -182,6 +211,8 @@ class SystemHealthResponse(BaseModel):
     embeddings: str
     version: str = "0.1.0"
 
+    model_config = ConfigDict(frozen=True)
+
 
 class ErrorResponse(BaseModel):
     """Standard error response."""
@@ -189,3 +220,5 @@ class ErrorResponse(BaseModel):
     error: str
     request_id: str | None = None
     details: dict[str, Any] | None = None
+
+    model_config = ConfigDict(frozen=True)
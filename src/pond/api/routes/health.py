@@ -1,5 +1,8 @@
 """Health check endpoints."""
 
+import asyncio
+import time
+
 import structlog
 from fastapi import APIRouter, Depends, Request
 
@@ -12,6 +15,30 @@ from pond.startup_check import get_health_status
 logger = structlog.get_logger()
 router = APIRouter(tags=["health"])
 
+# Authenticated probes repeat the same aggregate; each tenant's stats are
+# shared for this long, and concurrent misses wait on a single query
+STATS_TTL = 2.0
+_stats_cache: dict[str, tuple[float, dict]] = {}  # tenant -> (expiry, stats)
+_stats_locks: dict[str, asyncio.Lock] = {}
+
+
+async def _cached_tenant_stats(db_pool: DatabasePool, tenant: str) -> dict:
+    """get_tenant_stats, at most once per tenant per STATS_TTL."""
+    cached = _stats_cache.get(tenant)
+    if cached is not None and time.monotonic() < cached[0]:
+        return cached[1]
+
+    async with _stats_locks.setdefault(tenant, asyncio.Lock()):
+        # Another probe may have refreshed it while we waited
+        cached = _stats_cache.get(tenant)
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1]
+
+        async with db_pool.acquire() as conn:
+            stats = await get_tenant_stats(conn, tenant)
+        _stats_cache[tenant] = (time.monotonic() + STATS_TTL, stats)
+        return stats
+
 
 @router.get("/health")
 async def health_check(
@@ -24,63 +51,33 @@ async def health_check(
     - Valid API key: Returns system health + tenant-specific stats
     - Invalid API key: Already rejected by middleware (401)
     """
-    # Check database
-    try:
-        async with db_pool.acquire() as conn:
-            await conn.fetchval("SELECT 1")
-        db_status = "healthy"
-    except Exception:
-        db_status = "unhealthy"
+    # Check if we have an authenticated tenant (None when unauthenticated)
+    tenant = request.state.tenant
+
+    # Check database (free when real queries have succeeded recently). For
+    # a tenant, the stats query is independent of it, so run both at once.
+    if tenant:
+        db_healthy, stats = await asyncio.gather(
+            db_pool.is_healthy(),
+            _cached_tenant_stats(db_pool, tenant),
+            return_exceptions=True,
+        )
+    else:
+        db_healthy, stats = await db_pool.is_healthy(), None
+    db_status = "healthy" if db_healthy is True else "unhealthy"
 
     # Check embeddings
     embedding_health = get_health_status()
     embedding_status = "healthy" if embedding_health["healthy"] else "degraded"
 
-    # Check if we have an authenticated tenant
-    tenant = getattr(request.state, "tenant", None)
-
     if tenant:
         # Authenticated - return tenant-specific health
-        try:
-            # Get tenant statistics
-            async with db_pool.acquire() as conn:
-                stats = await get_tenant_stats(conn, tenant)
-
-            # Parse dates if they exist
-            oldest = None
-            newest = None
-            if stats["oldest_memory"]:
-                from datetime import datetime
-
-                oldest = datetime.fromisoformat(stats["oldest_memory"])
-            if stats["newest_memory"]:
-                from datetime import datetime
-
-                newest = datetime.fromisoformat(stats["newest_memory"])
-
-            logger.info(
-                "tenant_health_check",
-                tenant=tenant,
-                memory_count=stats["memory_count"],
-                embedding_count=stats["embedding_count"],
-            )
-
-            return TenantHealthResponse(
-                status="healthy" if db_status == "healthy" else "degraded",
-                tenant=tenant,
-                memory_count=stats["memory_count"],
-                embedding_count=stats["embedding_count"],
-                oldest_memory=oldest,
-                newest_memory=newest,
-                embedding_provider=embedding_health["provider"],
-                embedding_healthy=embedding_health["healthy"],
-            )
-
-        except Exception as e:
-            logger.exception(
+        if isinstance(stats, Exception):
+            logger.error(
                 "tenant_health_error",
                 tenant=tenant,
-                error=str(e),
+                error=str(stats),
+                exc_info=stats,
             )
             # Return degraded status with partial info
             return TenantHealthResponse(
@@ -93,6 +90,25 @@ async def health_check(
                 embedding_provider=embedding_health["provider"],
                 embedding_healthy=False,
             )
+
+        logger.info(
+            "tenant_health_check",
+            tenant=tenant,
+            memory_count=stats["memory_count"],
+            embedding_count=stats["embedding_count"],
+        )
+
+        return TenantHealthResponse(
+            status="healthy" if db_status == "healthy" else "degraded",
+            tenant=tenant,
+            memory_count=stats["memory_count"],
+            embedding_count=stats["embedding_count"],
+            # TIMESTAMPTZ columns arrive as datetimes from asyncpg
+            oldest_memory=stats["oldest_memory"],
+            newest_memory=stats["newest_memory"],
+            embedding_provider=embedding_health["provider"],
+            embedding_healthy=embedding_health["healthy"],
+        )
     else:
         # Not authenticated - return basic system health only
         return SystemHealthResponse(
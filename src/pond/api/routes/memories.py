@@ -1,8 +1,30 @@
 """Memory management API endpoints."""
 
+import asyncio
+import base64
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from datetime import timedelta
+from typing import Literal
+
+import numpy as np
+import orjson
 import pendulum
 import structlog
-from fastapi import APIRouter, Body, Depends, HTTPException, Path, Request, status
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    HTTPException,
+    Path,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pendulum import DateTime
 
 from pond.api.dependencies import get_repository
 from pond.api.models import (
@@ -13,9 +35,12 @@ from pond.api.models import (
     RecentResponse,
     SearchRequest,
     SearchResponse,
+    StoreBatchRequest,
+    StoreBatchResponse,
     StoreRequest,
     StoreResponse,
 )
+from pond.domain.memory import Memory
 from pond.domain.repository import MemoryRepository
 from pond.metrics import (
     memories_stored,
@@ -23,9 +48,129 @@ from pond.metrics import (
     search_duration,
     searches_performed,
 )
+from pond.utils.time_service import TimeService
 
 logger = structlog.get_logger()
 
+# Built once: constructing a TimeService runs timezone detection
+time_service = TimeService()
+
+# Default window for recent memories
+RECENT_WINDOW = timedelta(hours=24)
+
+# Rows per chunk of a streamed NDJSON /vectors response
+NDJSON_CHUNK_ROWS = 64
+
+
+async def _recent_memories(
+    repository: MemoryRepository, tenant: str, window: timedelta, limit: int
+) -> list[Memory]:
+    """Fetch a tenant's memories from the last window, counted as a recent search.
+
+    Shared by /recent and by /search with an empty query.
+    """
+    with search_duration.labels(tenant=tenant, type="recent").time():
+        memories = await repository.get_recent(
+            tenant=tenant,
+            since=time_service.now() - window,
+            limit=limit,
+        )
+
+    # Track this as a recent search
+    searches_performed.labels(tenant=tenant, type="recent").inc()
+
+    logger.info(
+        "recent_memories_fetched",
+        tenant=tenant,
+        hours=window.total_seconds() / 3600,
+        limit=limit,
+        count=len(memories),
+    )
+    return memories
+
+
+# Sessions connecting in a burst all call /init at once; concurrent callers
+# asking for the same (tenant, minute, limit) share one query
+_init_inflight: dict[tuple, asyncio.Task] = {}
+
+
+async def _coalesced_recent(
+    repository: MemoryRepository, tenant: str, since: DateTime, limit: int
+) -> list[Memory]:
+    """get_recent_or_empty with since floored to the minute, single-flight."""
+    since = since.replace(second=0, microsecond=0)
+    key = (tenant, since, limit)
+
+    task = _init_inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(
+            repository.get_recent_or_empty(tenant=tenant, since=since, limit=limit)
+        )
+        _init_inflight[key] = task
+        task.add_done_callback(lambda _: _init_inflight.pop(key, None))
+    # Shielded, so a caller disconnecting doesn't fail the others waiting on it
+    return await asyncio.shield(task)
+
+
+# Identical searches (UI reruns, polling agents) within SEARCH_TTL reuse the
+# serialized response, and concurrent misses share a single search
+SEARCH_CACHE_SIZE = 10_000
+SEARCH_TTL = 5.0
+# (tenant, generation, blake2b of query, limit) -> (monotonic expiry, body,
+# result count)
+_search_cache: OrderedDict[tuple, tuple[float, bytes, int]] = OrderedDict()
+_search_inflight: dict[tuple, asyncio.Task] = {}
+# Bumped by /store, so a new memory is never hidden behind a cached search
+_search_generation: dict[str, int] = {}
+
+
+async def _search_json(
+    repository: MemoryRepository, tenant: str, query: str, limit: int, key: tuple
+) -> tuple[bytes, int]:
+    """Run a search, serialize it as a SearchResponse and cache the body."""
+    # Timed here, on a miss, so cache hits don't skew the latency histogram
+    with search_duration.labels(tenant=tenant, type="semantic").time():
+        memories = await repository.search(tenant=tenant, query=query, limit=limit)
+    memory_responses = MemoryResponse.from_memories(memories)
+    count = len(memory_responses)
+    body = SearchResponse(
+        memories=memory_responses,
+        count=count,
+    ).model_dump_json().encode()
+
+    _search_cache[key] = (time.monotonic() + SEARCH_TTL, body, count)
+    if len(_search_cache) > SEARCH_CACHE_SIZE:
+        _search_cache.popitem(last=False)
+    return body, count
+
+
+async def _cached_search(
+    repository: MemoryRepository, tenant: str, query: str, limit: int
+) -> tuple[bytes, int, bool]:
+    """Serialized search results, their count, and whether they were cached."""
+    digest = hashlib.blake2b(query.encode(), digest_size=16).digest()
+    key = (tenant, _search_generation.get(tenant, 0), digest, limit)
+
+    cached = _search_cache.get(key)
+    if cached is not None:
+        if time.monotonic() < cached[0]:
+            _search_cache.move_to_end(key)
+            return cached[1], cached[2], True
+        del _search_cache[key]
+
+    task = _search_inflight.get(key)
+    if task is not None:
+        body, count = await asyncio.shield(task)
+        return body, count, True
+
+    # Shielded, so a caller disconnecting doesn't fail the others waiting on it
+    task = asyncio.ensure_future(_search_json(repository, tenant, query, limit, key))
+    _search_inflight[key] = task
+    task.add_done_callback(lambda _: _search_inflight.pop(key, None))
+    body, count = await asyncio.shield(task)
+    return body, count, False
+
+
 router = APIRouter(
     tags=["memories"],
 )
@@ -42,65 +187,68 @@ async def store_memory(
     The splash contains semantically similar memories (0.7-0.9 similarity)
     to help maintain context.
     """
-    try:
-        # Get tenant from authenticated request
-        tenant = request.state.tenant
+    # Get tenant from authenticated request
+    tenant = request.state.tenant
 
-        # Store the memory with metrics tracking
-        logger.info(
-            "storing_memory",
+    # Store the memory with metrics tracking
+    with memory_store_duration.labels(tenant=tenant).time():
+        memory, splash_memories = await repository.store(
             tenant=tenant,
-            content_length=len(store_request.content),
-            tag_count=len(store_request.tags),
+            content=store_request.content,
+            user_tags=store_request.tags,
         )
 
-        with memory_store_duration.labels(tenant=tenant).time():
-            memory, splash_memories = await repository.store(
-                tenant=tenant,
-                content=store_request.content,
-                user_tags=store_request.tags,
-            )
+    # Increment the stored memories counter
+    memories_stored.labels(tenant=tenant).inc()
+    _search_generation[tenant] = _search_generation.get(tenant, 0) + 1
 
-        # Increment the stored memories counter
-        memories_stored.labels(tenant=tenant).inc()
+    # One line per store, with the request and result fields together
+    logger.info(
+        "memory_stored",
+        tenant=tenant,
+        content_length=len(store_request.content),
+        tag_count=len(store_request.tags),
+        memory_id=memory.id,
+        splash_count=len(splash_memories),
+    )
 
-        logger.info(
-            "memory_stored",
-            tenant=tenant,
-            memory_id=memory.id,
-            splash_count=len(splash_memories),
-        )
+    # Convert to response models
+    splash_response = MemoryResponse.from_memories(splash_memories)
 
-        # Convert to response models
-        splash_response = [MemoryResponse.from_memory(m) for m in splash_memories]
+    return StoreResponse(
+        id=memory.id or 0,  # Should never be None after storage
+        splash=splash_response,
+    )
 
-        return StoreResponse(
-            id=memory.id or 0,  # Should never be None after storage
-            splash=splash_response,
-        )
 
-    except ValueError as e:
-        # Validation errors from the repository
-        logger.warning(
-            "store_validation_error",
-            tenant=tenant,
-            error=str(e),
-        )
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e),
-        ) from e
-    except Exception as e:
-        # Unexpected errors
-        logger.exception(
-            "store_error",
-            tenant=tenant,
-            error=str(e),
-        )
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to store memory",
-        ) from e
+@router.post("/store/batch", response_model=StoreBatchResponse)
+async def store_memories(
+    batch_request: StoreBatchRequest,
+    request: Request,
+    repository: MemoryRepository = Depends(get_repository),  # noqa: B008
+) -> StoreBatchResponse:
+    """Store several memories in one request.
+
+    Embeddings and feature extraction run across the whole batch and the
+    rows are inserted together. No splash is returned.
+    """
+    tenant = request.state.tenant
+
+    memories = await repository.store_many(
+        tenant=tenant,
+        items=[(item.content, item.tags) for item in batch_request.memories],
+    )
+
+    memories_stored.labels(tenant=tenant).inc(len(memories))
+    _search_generation[tenant] = _search_generation.get(tenant, 0) + 1
+
+    logger.info(
+        "memories_stored",
+        tenant=tenant,
+        memory_count=len(memories),
+    )
+
+    return StoreBatchResponse(ids=[memory.id or 0 for memory in memories])
 
 
 @router.post("/search", response_model=SearchResponse)
@@ -108,100 +256,49 @@ async def search_memories(
     search_request: SearchRequest,
     request: Request,
     repository: MemoryRepository = Depends(get_repository),  # noqa: B008
-) -> SearchResponse:
+) -> SearchResponse | Response:
     """Search memories or return recent memories if no query.
 
     Empty query returns recent memories (last 24 hours by default).
     Non-empty query uses unified search across text, features, and semantics.
     """
-    try:
-        # Get tenant from authenticated request
-        tenant = request.state.tenant
-        search_type = "recent" if not search_request.query else "semantic"
-
-        with search_duration.labels(tenant=tenant, type=search_type).time():
-            if not search_request.query:
-                # Empty query - return recent memories
-                logger.info(
-                    "fetching_recent_memories",
-                    tenant=tenant,
-                    limit=search_request.limit,
-                )
-
-                # Get memories from last 24 hours
-                from datetime import timedelta
-
-                from pond.utils.time_service import TimeService
-
-                time_service = TimeService()
-                since = time_service.now() - timedelta(hours=24)
-
-                memories = await repository.get_recent(
-                    tenant=tenant,
-                    since=since,
-                    limit=search_request.limit,
-                )
-
-                logger.info(
-                    "recent_memories_fetched",
-                    tenant=tenant,
-                    count=len(memories),
-                )
-            else:
-                # Search with query
-                logger.info(
-                    "searching_memories",
-                    tenant=tenant,
-                    query=search_request.query,
-                    limit=search_request.limit,
-                )
-
-                memories = await repository.search(
-                    tenant=tenant,
-                    query=search_request.query,
-                    limit=search_request.limit,
-                )
-
-                logger.info(
-                    "search_completed",
-                    tenant=tenant,
-                    query=search_request.query,
-                    result_count=len(memories),
-                )
-
-        # Increment search counter
-        searches_performed.labels(tenant=tenant, type=search_type).inc()
-
-        # Convert to response models
-        memory_responses = [MemoryResponse.from_memory(m) for m in memories]
+    # Get tenant from authenticated request
+    tenant = request.state.tenant
 
-        return SearchResponse(
-            memories=memory_responses,
-            count=len(memory_responses),
+    if not search_request.query:
+        # Empty query - exactly /recent over the last 24 hours
+        memories = await _recent_memories(
+            repository, tenant, RECENT_WINDOW, search_request.limit
         )
-
-    except ValueError as e:
-        # Validation errors
-        logger.warning(
-            "search_validation_error",
-            tenant=tenant,
-            error=str(e),
+    else:
+        # Search with query (already serialized, possibly cached)
+        body, result_count, cached = await _cached_search(
+            repository,
+            tenant,
+            search_request.query,
+            search_request.limit,
         )
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e),
-        ) from e
-    except Exception as e:
-        # Unexpected errors
-        logger.exception(
-            "search_error",
+
+        # Increment search counter
+        searches_performed.labels(tenant=tenant, type="semantic").inc()
+
+        logger.info(
+            "search_completed",
             tenant=tenant,
-            error=str(e),
+            query=search_request.query,
+            limit=search_request.limit,
+            result_count=result_count,
+            cached=cached,
         )
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to search memories",
-        ) from e
+        return Response(content=body, media_type="application/json")
+
+    # Convert to response models
+    memory_responses = MemoryResponse.from_memories(memories)
+
+    return SearchResponse(
+        memories=memory_responses,
+        count=len(memory_responses),
+    )
 
 
 @router.post("/recent", response_model=RecentResponse)
@@ -214,73 +311,28 @@ async def get_recent_memories(
 
     Returns memories from the last N hours (default 24).
     """
-    try:
-        # Get tenant from authenticated request
-        tenant = request.state.tenant
-
-        from datetime import timedelta
-
-        from pond.utils.time_service import TimeService
-
-        # Calculate the time window
-        time_service = TimeService()
-        hours = recent_request.hours if recent_request.hours else 24
-        since = time_service.now() - timedelta(hours=hours)
-
-        logger.info(
-            "fetching_recent_memories",
-            tenant=tenant,
-            hours=hours,
-            limit=recent_request.limit,
-        )
-
-        # Get recent memories with metrics tracking
-        with search_duration.labels(tenant=tenant, type="recent").time():
-            memories = await repository.get_recent(
-                tenant=tenant,
-                since=since,
-                limit=recent_request.limit,
-            )
+    # Get tenant from authenticated request
+    tenant = request.state.tenant
 
-        # Track this as a recent search
-        searches_performed.labels(tenant=tenant, type="recent").inc()
+    # Calculate the time window
+    window = (
+        timedelta(hours=recent_request.hours)
+        if recent_request.hours
+        else RECENT_WINDOW
+    )
 
-        logger.info(
-            "recent_memories_fetched",
-            tenant=tenant,
-            count=len(memories),
-        )
+    # Get recent memories with metrics tracking
+    memories = await _recent_memories(
+        repository, tenant, window, recent_request.limit
+    )
 
-        # Convert to response models
-        memory_responses = [MemoryResponse.from_memory(m) for m in memories]
+    # Convert to response models
+    memory_responses = MemoryResponse.from_memories(memories)
 
-        return RecentResponse(
-            memories=memory_responses,
-            count=len(memory_responses),
-        )
-
-    except ValueError as e:
-        # Validation errors
-        logger.warning(
-            "recent_validation_error",
-            tenant=tenant,
-            error=str(e),
-        )
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e),
-        ) from e
-    except Exception as e:
-        # Unexpected errors
-        logger.exception(
-            "recent_error",
-            tenant=tenant,
-            error=str(e),
-        )
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to fetch recent memories",
-        ) from e
+    return RecentResponse(
+        memories=memory_responses,
+        count=len(memory_responses),
+    )
 
 
 @router.post("/init", response_model=InitResponse)
@@ -294,57 +346,33 @@ async def initialize_context(
     This endpoint is designed for AI assistants to get their initial context.
     Returns the current time (for temporal awareness) and recent memories.
     """
-    try:
-        # Get tenant from authenticated request
-        tenant = request.state.tenant
-
-        from datetime import timedelta
-
-        from pond.utils.time_service import TimeService
-
-        # Get current time
-        time_service = TimeService()
-        current_time = time_service.now()
-
-        # Get recent memories (last 24 hours, up to 10)
-        since = current_time - timedelta(hours=24)
-
-        logger.info(
-            "initializing_context",
-            tenant=tenant,
-        )
+    # Get tenant from authenticated request
+    tenant = request.state.tenant
 
-        memories = await repository.get_recent(
-            tenant=tenant,
-            since=since,
-            limit=10,  # Default to 10 recent memories for init
-        )
+    # Get current time
+    current_time = time_service.now()
 
-        logger.info(
-            "context_initialized",
-            tenant=tenant,
-            memory_count=len(memories),
-        )
+    # Get recent memories (last 24 hours, up to 10)
+    memories = await _coalesced_recent(
+        repository,
+        tenant,
+        current_time - RECENT_WINDOW,
+        10,  # Default to 10 recent memories for init
+    )
 
-        # Convert to response models
-        memory_responses = [MemoryResponse.from_memory(m) for m in memories]
+    logger.info(
+        "context_initialized",
+        tenant=tenant,
+        memory_count=len(memories),
+    )
 
-        return InitResponse(
-            current_time=current_time,
-            recent_memories=memory_responses,
-        )
+    # Convert to response models
+    memory_responses = MemoryResponse.from_memories(memories)
 
-    except Exception as e:
-        # Unexpected errors
-        logger.exception(
-            "init_error",
-            tenant=tenant,
-            error=str(e),
-        )
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to initialize context",
-        ) from e
+    return InitResponse(
+        current_time=current_time,
+        recent_memories=memory_responses,
+    )
 
 
 from pydantic import BaseModel
@@ -352,12 +380,60 @@ from pydantic import BaseModel
 class VectorsRequest(BaseModel):
     """Request for fetching vectors."""
     limit: int = 2000
+    # f32: embeddings as JSON float lists (what THE VISUALIZER reads).
+    # f16/i8: one base64 little-endian matrix, 2x/4x smaller on the wire.
+    dtype: Literal["f32", "f16", "i8"] = "f32"
+    # ndjson: one f32 memory per line, streamed instead of one JSON document
+    format: Literal["json", "ndjson"] = "json"
+
+
+def _pack_vectors(vectors: list[dict], dtype: str) -> dict:
+    """Move the embeddings out of each memory into one quantized matrix.
+
+    i8 rows are scaled to their own max magnitude; row i decodes as
+    int8_value * scales[i] / 127.
+    """
+    embeddings = [vector.pop("embedding") for vector in vectors]
+    matrix = np.stack(embeddings) if embeddings else np.empty((0, 0), np.float32)
+
+    packed = {"dtype": dtype, "shape": list(matrix.shape), "memories": vectors}
+    if dtype == "f16":
+        data = matrix.astype("<f2")
+    else:
+        scales = np.abs(matrix).max(axis=1) if len(matrix) else np.empty(0)
+        scales[scales == 0] = 1.0
+        data = np.round(matrix / scales[:, None] * 127).astype(np.int8)
+        packed["scales"] = scales.astype(np.float32)
+    packed["data"] = base64.b64encode(data.tobytes()).decode("ascii")
+    return packed
+
+
+async def _ndjson_rows(memories: list[Memory]) -> AsyncIterator[bytes]:
+    """Serialize memories as NDJSON, NDJSON_CHUNK_ROWS lines per chunk.
+
+    Async so Starlette sends it from the event loop rather than hopping
+    to the threadpool for every chunk.
+    """
+    for start in range(0, len(memories), NDJSON_CHUNK_ROWS):
+        yield b"".join(
+            orjson.dumps(
+                {
+                    "id": memory.id,
+                    "content": memory.content,
+                    "embedding": memory.embedding,
+                    "created_at": memory.metadata.get("created_at"),
+                },
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE,
+            )
+            for memory in memories[start : start + NDJSON_CHUNK_ROWS]
+        )
+
 
 @router.post("/vectors")
 async def get_vectors(
     body: VectorsRequest = Body(...),
     request: Request = None,
-) -> dict:
+) -> Response:
     """Get memories with embeddings for 3D visualization.
     
     Returns the most recent memories with their 768-dimensional embeddings
@@ -365,54 +441,69 @@ async def get_vectors(
     """
     repository: MemoryRepository = request.app.state.memory_repository
     
-    # Get tenant from the authenticated API key - this was set by AuthenticationMiddleware
+    # Get tenant from the authenticated API key - this was set by PondMiddleware
     tenant = request.state.tenant
     if not tenant:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="No authenticated tenant",
         )
-    
-    try:
-        logger.info(
-            "fetching_vectors",
-            tenant=tenant,
-            limit=body.limit,
-        )
-        
-        # Get recent memories with embeddings
-        memories = await repository.get_recent(
-            tenant=tenant,
-            since=pendulum.now("UTC").subtract(years=1),  # Last year of memories
-            limit=body.limit,
+    if body.format == "ndjson" and body.dtype != "f32":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ndjson vectors are only available as f32",
         )
-        
-        # Filter to only memories with embeddings and format for visualization
-        vectors = []
-        for memory in memories:
-            if memory.embedding is not None:
-                vectors.append({
-                    "id": memory.id,
-                    "content": memory.content,
-                    "embedding": memory.embedding.tolist(),
-                    "created_at": memory.metadata.get("created_at"),
-                })
-        
+    
+    # Get recent memories with embeddings (the rest are skipped in SQL)
+    memories = await repository.get_recent_with_embeddings(
+        tenant=tenant,
+        since=pendulum.now("UTC").subtract(years=1),  # Last year of memories
+        limit=body.limit,
+    )
+
+    if body.format == "ndjson":
         logger.info(
             "vectors_fetched",
             tenant=tenant,
-            count=len(vectors),
+            limit=body.limit,
+            count=len(memories),
+            format=body.format,
         )
-        
-        return {"memories": vectors}
-        
-    except Exception as e:
-        logger.exception(
-            "vectors_error",
-            tenant=tenant,
-            error=str(e),
+        # The rows are already loaded; only their encoded bytes are
+        # streamed, a chunk at a time, instead of built as one body
+        return StreamingResponse(
+            _ndjson_rows(memories),
+            media_type="application/x-ndjson",
         )
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to fetch vectors",
-        ) from e
+    
+    # Format for visualization
+    vectors = [
+        {
+            "id": memory.id,
+            "content": memory.content,
+            "embedding": memory.embedding,  # Serialized from the buffer
+            "created_at": memory.metadata.get("created_at"),
+        }
+        for memory in memories
+    ]
+    
+    logger.info(
+        "vectors_fetched",
+        tenant=tenant,
+        limit=body.limit,
+        count=len(vectors),
+    )
+    
+    payload = (
+        {"memories": vectors}
+        if body.dtype == "f32"
+        else _pack_vectors(vectors, body.dtype)
+    )
+
+    # orjson writes the numpy arrays straight from their buffers,
+    # instead of boxing ~1.5M floats into Python objects via tolist()
+    return Response(
+        content=orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
+        media_type="application/json",
+    )
+
@@ -2,12 +2,15 @@
 
 import asyncio
 import sys
+from collections.abc import AsyncIterator, Coroutine
+from contextlib import asynccontextmanager
+from typing import Any
 
 import click
 import structlog
 
 from pond.infrastructure.auth import APIKeyManager
-from pond.infrastructure.database import DatabasePool
+from pond.infrastructure.database import DatabasePool, TenantNotFound
 from pond.infrastructure.schema import ensure_tenant_schema, list_tenants, tenant_exists
 
 # Configure logging for CLI
@@ -23,6 +26,33 @@ structlog.configure(
 
 logger = structlog.get_logger()
 
+try:
+    import uvloop
+except ImportError:  # uvloop has no Windows build
+    _loop_factory = None
+else:
+    _loop_factory = uvloop.new_event_loop
+
+
+def _run[T](main: Coroutine[Any, Any, T]) -> T:
+    """Run a command's coroutine, on uvloop where it's installed."""
+    return asyncio.run(main, loop_factory=_loop_factory)
+
+
+@asynccontextmanager
+async def _pool() -> AsyncIterator[DatabasePool]:
+    """A database pool for one command.
+
+    Commands run a query or two on a single connection, so don't pay to
+    open the server's full pool (or its health probe connection).
+    """
+    pool = DatabasePool(min_size=1, max_size=2, health_probe=False)
+    try:
+        await pool.initialize()
+        yield pool
+    finally:
+        await pool.close()
+
 
 @click.group()
 @click.pass_context
@@ -48,9 +78,7 @@ def tenant_list(ctx):
     """List all tenants."""
 
     async def _list():
-        pool = DatabasePool()
-        try:
-            await pool.initialize()
+        async with _pool() as pool:
             async with pool.acquire() as conn:
                 tenants = await list_tenants(conn)
                 if not tenants:
@@ -59,10 +87,8 @@ def tenant_list(ctx):
                     click.echo(f"Found {len(tenants)} tenant(s):")
                     for t in tenants:
                         click.echo(f"  - {t}")
-        finally:
-            await pool.close()
 
-    asyncio.run(_list())
+    _run(_list())
 
 
 @tenant.command(name="create")
@@ -73,33 +99,27 @@ def tenant_create(ctx, name: str, with_key: bool):
     """Create a new tenant."""
 
     async def _create():
-        pool = DatabasePool()
-        try:
-            await pool.initialize()
-
+        async with _pool() as pool, pool.acquire() as conn:
             # Check if tenant already exists
-            async with pool.acquire() as conn:
-                if await tenant_exists(conn, name):
-                    click.echo(f"Error: Tenant '{name}' already exists.", err=True)
-                    sys.exit(1)
+            if await tenant_exists(conn, name):
+                click.echo(f"Error: Tenant '{name}' already exists.", err=True)
+                sys.exit(1)
 
-                # Create the tenant schema
+            # Schema and first key on one connection, committed together
+            key = None
+            async with conn.transaction():
                 await ensure_tenant_schema(conn, name)
-                click.echo(f"✓ Created tenant: {name}")
+                if with_key:
+                    key = await APIKeyManager(pool).create_key(
+                        name, description=f"Initial key for {name}", conn=conn
+                    )
 
-            # Generate API key if requested
-            if with_key:
-                api_key_manager = APIKeyManager(pool)
-                key = await api_key_manager.create_key(
-                    name, description=f"Initial key for {name}"
-                )
+            click.echo(f"✓ Created tenant: {name}")
+            if key is not None:
                 click.echo(f"✓ Generated API key: {key}")
                 click.echo("\n⚠️  Save this key now! It cannot be retrieved later.")
 
-        finally:
-            await pool.close()
-
-    asyncio.run(_create())
+    _run(_create())
 
 
 @cli.group()
@@ -117,16 +137,7 @@ def key_generate(ctx, tenant: str, description: str | None):
     """Generate a new API key for a tenant."""
 
     async def _generate():
-        pool = DatabasePool()
-        try:
-            await pool.initialize()
-
-            # Check tenant exists
-            async with pool.acquire() as conn:
-                if not await tenant_exists(conn, tenant):
-                    click.echo(f"Error: Tenant '{tenant}' does not exist.", err=True)
-                    sys.exit(1)
-
+        async with _pool() as pool:
             # Generate key
             api_key_manager = APIKeyManager(pool)
             key = await api_key_manager.create_key(tenant, description)
@@ -135,10 +146,11 @@ def key_generate(ctx, tenant: str, description: str | None):
             click.echo(f"  {key}")
             click.echo("\n⚠️  Save this key now! It cannot be retrieved later.")
 
-        finally:
-            await pool.close()
-
-    asyncio.run(_generate())
+    try:
+        _run(_generate())
+    except TenantNotFound:
+        click.echo(f"Error: Tenant '{tenant}' does not exist.", err=True)
+        sys.exit(1)
 
 
 @key.command(name="list")
@@ -148,16 +160,7 @@ def key_list(ctx, tenant: str):
     """List API keys for a tenant."""
 
     async def _list():
-        pool = DatabasePool()
-        try:
-            await pool.initialize()
-
-            # Check tenant exists
-            async with pool.acquire() as conn:
-                if not await tenant_exists(conn, tenant):
-                    click.echo(f"Error: Tenant '{tenant}' does not exist.", err=True)
-                    sys.exit(1)
-
+        async with _pool() as pool:
             # List keys
             api_key_manager = APIKeyManager(pool)
             keys = await api_key_manager.list_keys(tenant)
@@ -173,10 +176,11 @@ def key_list(ctx, tenant: str):
                     if k["description"]:
                         click.echo(f"      {k['description']}")
 
-        finally:
-            await pool.close()
-
-    asyncio.run(_list())
+    try:
+        _run(_list())
+    except TenantNotFound:
+        click.echo(f"Error: Tenant '{tenant}' does not exist.", err=True)
+        sys.exit(1)
 
 
 @key.command(name="rotate")
@@ -189,16 +193,7 @@ def key_rotate(ctx, tenant: str, old_key: str | None):
     """Rotate API keys for a tenant."""
 
     async def _rotate():
-        pool = DatabasePool()
-        try:
-            await pool.initialize()
-
-            # Check tenant exists
-            async with pool.acquire() as conn:
-                if not await tenant_exists(conn, tenant):
-                    click.echo(f"Error: Tenant '{tenant}' does not exist.", err=True)
-                    sys.exit(1)
-
+        async with _pool() as pool:
             # Rotate key(s)
             api_key_manager = APIKeyManager(pool)
             new_key = await api_key_manager.rotate_key(tenant, old_key)
@@ -212,10 +207,11 @@ def key_rotate(ctx, tenant: str, old_key: str | None):
             click.echo(f"  {new_key}")
             click.echo("\n⚠️  Save this key now! It cannot be retrieved later.")
 
-        finally:
-            await pool.close()
-
-    asyncio.run(_rotate())
+    try:
+        _run(_rotate())
+    except TenantNotFound:
+        click.echo(f"Error: Tenant '{tenant}' does not exist.", err=True)
+        sys.exit(1)
 
 
 @key.command(name="deactivate")
@@ -226,16 +222,7 @@ def key_deactivate(ctx, tenant: str, key_id: int):
     """Deactivate a specific API key."""
 
     async def _deactivate():
-        pool = DatabasePool()
-        try:
-            await pool.initialize()
-
-            # Check tenant exists
-            async with pool.acquire() as conn:
-                if not await tenant_exists(conn, tenant):
-                    click.echo(f"Error: Tenant '{tenant}' does not exist.", err=True)
-                    sys.exit(1)
-
+        async with _pool() as pool:
             # Deactivate key
             api_key_manager = APIKeyManager(pool)
             if await api_key_manager.deactivate_key(tenant, key_id):
@@ -246,10 +233,11 @@ def key_deactivate(ctx, tenant: str, key_id: int):
                 )
                 sys.exit(1)
 
-        finally:
-            await pool.close()
-
-    asyncio.run(_deactivate())
+    try:
+        _run(_deactivate())
+    except TenantNotFound:
+        click.echo(f"Error: Tenant '{tenant}' does not exist.", err=True)
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -43,10 +43,18 @@ class Settings(BaseSettings):
     ollama_embedding_model: str | None = None
     ollama_embedding_timeout: int = 60
 
+    # Feature extraction: worker processes for batch ingest (each loads its
+    # own spaCy model, ~1 GB, on the first large batch); 0 keeps batches on
+    # a thread. Opt-in.
+    nlp_processes: int = 0
+
     # Logging
     log_level: str = "INFO"
     log_format: str = "json"
 
+    # Metrics
+    enable_metrics: bool = False  # Record per-request HTTP metrics
+
     # Time handling
     pond_timezone: str | None = None
     geoip_url: str | None = "https://ipapi.co/json/"
@@ -79,21 +87,6 @@ class Settings(BaseSettings):
             # ollama_embedding_timeout has a default too
         return self
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        # Parse database URL if individual components not provided
-        if not any(
-            [self.db_host, self.db_port, self.db_user, self.db_password, self.db_name]
-        ):
-            from urllib.parse import urlparse
-
-            parsed = urlparse(self.database_url)
-            self.db_host = self.db_host or parsed.hostname
-            self.db_port = self.db_port or parsed.port
-            self.db_user = self.db_user or parsed.username
-            self.db_password = self.db_password or parsed.password
-            self.db_name = self.db_name or parsed.path.lstrip("/")
-
 
 # Lazy settings initialization
 _settings = None
@@ -109,13 +102,24 @@ def get_settings() -> Settings:
 
 # This will be accessed as a property
 class SettingsProxy:
-    """Proxy to provide attribute access to settings."""
+    """Proxy to provide attribute access to settings.
+
+    The settings are resolved on first use and kept on the proxy, so later
+    reads and writes go straight to them.
+    """
+
+    __slots__ = ("_target",)
 
     def __getattr__(self, name):
-        return getattr(get_settings(), name)
+        # Reached for _target only until it's set, then for every setting
+        if name == "_target":
+            target = get_settings()
+            object.__setattr__(self, "_target", target)
+            return target
+        return getattr(self._target, name)
 
     def __setattr__(self, name, value):
-        setattr(get_settings(), name, value)
+        setattr(self._target, name, value)
 
 
 settings = SettingsProxy()
@@ -1,6 +1,6 @@
 """Base classes and protocols for domain models."""
 
-from typing import Protocol, TypeVar
+from typing import Protocol, Self
 
 
 class ValidationError(Exception):
@@ -13,9 +13,6 @@ class ValidationError(Exception):
 MAX_CONTENT_LENGTH = 7500
 
 
-T = TypeVar("T", bound="MetadataItem")
-
-
 class MetadataItem(Protocol):
     """Protocol for items that can be stored in Memory metadata."""
 
@@ -24,6 +21,6 @@ class MetadataItem(Protocol):
         ...
 
     @classmethod
-    def from_dict(cls: type[T], data: dict) -> T:
+    def from_dict(cls, data: dict) -> Self:
         """Hydrate from JSONB storage."""
         ...
@@ -2,8 +2,13 @@
 
 from dataclasses import dataclass
 
+PERSON_TYPES = frozenset({"PERSON", "PER"})
+LOCATION_TYPES = frozenset({"LOC", "GPE", "FAC"})
+ORGANIZATION_TYPES = frozenset({"ORG", "COMPANY"})
+PAST_TENSE_MARKERS = frozenset({"be", "have", "do", "will", "would", "could", "should"})
 
-@dataclass
+
+@dataclass(slots=True)
 class Entity:
     """An entity extracted from text."""
 
@@ -12,15 +17,15 @@ class Entity:
 
     def is_person(self) -> bool:
         """Check if this is a person entity."""
-        return self.type in ["PERSON", "PER"]
+        return self.type in PERSON_TYPES
 
     def is_location(self) -> bool:
         """Check if this is a location entity."""
-        return self.type in ["LOC", "GPE", "FAC"]
+        return self.type in LOCATION_TYPES
 
     def is_organization(self) -> bool:
         """Check if this is an organization entity."""
-        return self.type in ["ORG", "COMPANY"]
+        return self.type in ORGANIZATION_TYPES
 
     def to_dict(self) -> dict:
         """Serialize for JSONB storage."""
@@ -32,7 +37,7 @@ class Entity:
         return cls(text=data["text"], type=data["type"])
 
 
-@dataclass
+@dataclass(slots=True)
 class Action:
     """An action (verb) extracted from text."""
 
@@ -40,7 +45,7 @@ class Action:
 
     def is_past_tense_marker(self) -> bool:
         """Check if this is a common past tense helper verb."""
-        return self.lemma in ["be", "have", "do", "will", "would", "could", "should"]
+        return self.lemma in PAST_TENSE_MARKERS
 
     def to_dict(self) -> dict:
         """Serialize for JSONB storage."""
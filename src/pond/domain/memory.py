@@ -3,16 +3,30 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from datetime import UTC, datetime
 
 import numpy as np
-import pendulum
 
 from .base import MAX_CONTENT_LENGTH, ValidationError
 from .entities import Action, Entity
 from .tag import Tag
 
 
-@dataclass
+def _new_metadata() -> dict:
+    """Metadata for a brand-new memory (not used when metadata is passed in).
+
+    Same ISO 8601 UTC timestamp as pendulum.now("UTC").isoformat(), without
+    pendulum's timezone machinery.
+    """
+    return {
+        "created_at": datetime.now(UTC).isoformat(),
+        "tags": set(),  # Stored as set internally, serialized as list
+        "entities": [],
+        "actions": [],
+    }
+
+
+@dataclass(slots=True)
 class Memory:
     """A single memory with flexible metadata storage."""
 
@@ -23,13 +37,15 @@ class Memory:
     forgotten: bool = False
 
     # Flexible metadata (JSONB)
-    metadata: dict = field(
-        default_factory=lambda: {
-            "created_at": pendulum.now("UTC").isoformat(),
-            "tags": set(),  # Stored as set internally, serialized as list
-            "entities": [],
-            "actions": [],
-        }
+    metadata: dict = field(default_factory=_new_metadata)
+
+    # What add_entity/add_action have already seen, so deduplicating is a set
+    # lookup instead of a scan; each is (the list it indexes, its keys)
+    _entity_keys: tuple[list, set] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _action_keys: tuple[list, set] | None = field(
+        default=None, init=False, repr=False, compare=False
     )
 
     def __post_init__(self):
@@ -52,10 +68,8 @@ class Memory:
         if not content:
             raise ValidationError("Content cannot be empty")
 
-        # Strip leading/trailing whitespace for validation
-        cleaned = content.strip()
-
-        if not cleaned:
+        # isspace() scans in place instead of building a stripped copy
+        if content.isspace():
             raise ValidationError("Content cannot be only whitespace")
 
         if len(content) > MAX_CONTENT_LENGTH:
@@ -70,15 +84,12 @@ class Memory:
         if isinstance(tag, str):
             tag = Tag(tag)
 
-        if "tags" not in self.metadata:
-            self.metadata["tags"] = set()
-
-        self.metadata["tags"].add(tag.normalized)
+        self.metadata.setdefault("tags", set()).add(tag.normalized)
 
     def add_tags(self, *tags: str | Tag) -> None:
-        """Add multiple tags."""
-        for tag in tags:
-            self.add_tag(tag)
+        """Add multiple tags, normalized together in one spaCy batch."""
+        if tags:
+            self.metadata.setdefault("tags", set()).update(Tag.normalize_all(tags))
 
     def get_tags(self) -> list[str]:
         """Get all normalized tags."""
@@ -94,9 +105,15 @@ class Memory:
         if "entities" not in self.metadata:
             self.metadata["entities"] = []
 
-        serialized = entity.to_dict()
-        if serialized not in self.metadata["entities"]:
-            self.metadata["entities"].append(serialized)
+        entities = self.metadata["entities"]
+        if self._entity_keys is None or self._entity_keys[0] is not entities:
+            self._entity_keys = (entities, {(e["text"], e["type"]) for e in entities})
+
+        keys = self._entity_keys[1]
+        key = (entity.text, entity.type)
+        if key not in keys:
+            keys.add(key)
+            entities.append(entity.to_dict())
 
     def get_entities(self) -> list[Entity]:
         """Get entities as smart objects."""
@@ -110,9 +127,14 @@ class Memory:
         if "actions" not in self.metadata:
             self.metadata["actions"] = []
 
-        serialized = action.to_dict()
-        if serialized not in self.metadata["actions"]:
-            self.metadata["actions"].append(serialized)
+        actions = self.metadata["actions"]
+        if self._action_keys is None or self._action_keys[0] is not actions:
+            self._action_keys = (actions, {a["lemma"] for a in actions})
+
+        keys = self._action_keys[1]
+        if action.lemma not in keys:
+            keys.add(action.lemma)
+            actions.append(action.to_dict())
 
     def get_actions(self) -> list[Action]:
         """Get actions as smart objects."""
@@ -147,10 +169,13 @@ class Memory:
         if "tags" in metadata and isinstance(metadata["tags"], list):
             metadata["tags"] = set(metadata["tags"])
 
-        # Handle embedding
-        embedding = None
-        if data.get("embedding") is not None:
-            embedding = np.array(data["embedding"])
+        # Handle embedding: raw float32 bytes are viewed without copying,
+        # and float32 arrays pass straight through
+        embedding = data.get("embedding")
+        if isinstance(embedding, bytes | bytearray | memoryview):
+            embedding = np.frombuffer(embedding, dtype=np.float32)
+        elif embedding is not None:
+            embedding = np.asarray(embedding, dtype=np.float32)
 
         return cls(
             id=data.get("id"),
@@ -0,0 +1,44 @@
+"""The spaCy pipeline shared by feature extraction and tag normalization."""
+
+import threading
+
+SPACY_MODEL = "en_core_web_lg"
+
+# One pipeline per process (~1 GB), loaded on first use
+_nlp = None
+_nlp_lock = threading.Lock()
+
+
+def load_nlp(model: str):
+    """Load the spaCy pipeline without its dependency parser.
+
+    The parser is by far the slowest component, and nothing here needs it:
+    tagging, lemmatization and NER don't depend on it, and noun chunks come
+    from POS patterns instead.
+    """
+    import spacy
+
+    return spacy.load(model, exclude=["parser"])
+
+
+def get_nlp():
+    """The process's shared spaCy pipeline, loading it if needed."""
+    global _nlp
+    if _nlp is None:
+        # Stores extract features on worker threads; only one may load
+        with _nlp_lock:
+            if _nlp is None:
+                _nlp = load_nlp(SPACY_MODEL)
+    return _nlp
+
+
+def preload_nlp(model: str) -> None:
+    """Load the pipeline now, e.g. in a worker process initializer."""
+    global _nlp
+    with _nlp_lock:
+        _nlp = load_nlp(model)
+
+
+def nlp_loaded() -> bool:
+    """Whether this process has loaded its spaCy pipeline yet."""
+    return _nlp is not None
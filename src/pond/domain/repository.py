@@ -3,12 +3,21 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import contextlib
+import hashlib
+import itertools
 import logging
+import multiprocessing
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 
 import numpy as np
+import orjson
 from pendulum import DateTime
 
+from pond.config import settings
 from pond.infrastructure.database import DatabasePool
 from pond.metrics import current_memory_count, database_operation_duration
 from pond.services.embeddings import (
@@ -19,9 +28,50 @@ from pond.services.embeddings import (
 
 from .entities import Action, Entity
 from .memory import Memory
+from .nlp import SPACY_MODEL, get_nlp, nlp_loaded, preload_nlp
+from .tag import Tag
 
 logger = logging.getLogger(__name__)
 
+# pgvector's default hnsw.ef_search, which caps what one index scan returns
+DEFAULT_EF_SEARCH = 40
+
+# Nearest neighbours fetched before the splash similarity band is applied
+SPLASH_CANDIDATES = DEFAULT_EF_SEARCH
+
+# How long an empty recent-memories result is trusted without a query. Only
+# this process's stores invalidate it, so keep it short for the others.
+QUIET_TTL = 30.0
+
+# Seconds between recounts of every tenant's memories for the count gauge,
+# which stores only increment in between
+COUNT_REFRESH_INTERVAL = 60.0
+
+# Embedding requests in flight at once for a store_many batch
+EMBED_CONCURRENCY = 8
+
+# Recently embedded texts kept in memory (768 floats each, ~3 KB)
+EMBED_CACHE_SIZE = 1024
+
+# Batches at least this large are parsed in the spaCy worker processes;
+# smaller ones aren't worth the serialization and stay on a thread
+PROCESS_BATCH_MIN = 16
+
+# Noun chunks without the dependency parser: an optional determiner, then
+# adjectives and common nouns, or a run of proper nouns (kept apart so a
+# name doesn't swallow a following noun like "yesterday")
+NOUN_CHUNK_PATTERNS = [
+    [{"POS": "DET", "OP": "?"}, {"POS": "ADJ", "OP": "*"}, {"POS": "NOUN", "OP": "+"}],
+    [{"POS": "DET", "OP": "?"}, {"POS": "PROPN", "OP": "+"}],
+]
+
+
+def _parse_batch(contents: list[str]) -> bytes:
+    """Parse contents in a worker process, returned as a serialized DocBin."""
+    from spacy.tokens import DocBin
+
+    return DocBin(docs=get_nlp().pipe(contents, batch_size=32)).to_bytes()
+
 
 class MemoryRepository:
     """Repository for storing and retrieving memories."""
@@ -33,9 +83,14 @@ class MemoryRepository:
     ):
         """Initialize with database pool."""
         self.db_pool = db_pool
-        self._nlp = None
+        self._chunk_matcher = None
+        self._nlp_pool: ProcessPoolExecutor | None = None
         self._embedding_provider = embedding_provider
         self._provider_error = None
+        # tenant -> (no memories at or after this time, monotonic expiry)
+        self._quiet: dict[str, tuple[DateTime, float]] = {}
+        # blake2b(text) -> unit embedding, least recently used first
+        self._embed_cache: OrderedDict[bytes, np.ndarray] = OrderedDict()
 
         # Try to get provider if not explicitly provided
         if self._embedding_provider is None:
@@ -49,11 +104,32 @@ class MemoryRepository:
     @property
     def nlp(self):
         """Lazy load spaCy model for entity/action extraction."""
-        if self._nlp is None:
-            import spacy
+        return get_nlp()
 
-            self._nlp = spacy.load("en_core_web_lg")
-        return self._nlp
+    @property
+    def nlp_loaded(self) -> bool:
+        """Whether the spaCy model has been loaded in this process yet."""
+        return nlp_loaded()
+
+    def _noun_chunks(self, doc) -> list:
+        """Noun chunks of a doc from POS tags, longest match first."""
+        from spacy.util import filter_spans
+
+        if self._chunk_matcher is None:
+            from spacy.matcher import Matcher
+
+            matcher = Matcher(self.nlp.vocab)
+            matcher.add("NOUN_CHUNK", NOUN_CHUNK_PATTERNS)
+            self._chunk_matcher = matcher
+        # Overlapping matches collapse to the longest, in document order
+        return filter_spans(self._chunk_matcher(doc, as_spans=True))
+
+    def close(self) -> None:
+        """Shut down the spaCy worker processes, if any were started."""
+        if self._nlp_pool is not None:
+            # Don't block the (shutting down) event loop on the workers
+            self._nlp_pool.shutdown(wait=False, cancel_futures=True)
+            self._nlp_pool = None
 
     @property
     def embedding_provider(self) -> EmbeddingProvider:
@@ -76,26 +152,75 @@ class MemoryRepository:
         # Add user tags
         memory.add_tags(*user_tags)
 
-        # Extract features from content
-        await self._extract_features(memory)
-
-        # Get embedding
-        memory.embedding = await self._get_embedding(content)
+        # Extract features (spaCy, in a worker thread) while the embedding
+        # provider works on the same content - neither needs the other
+        _, memory.embedding = await asyncio.gather(
+            self._extract_features(memory),
+            self._get_embedding(content),
+        )
 
-        # Store in database with metrics tracking
+        # Store in database, fetching the splash in the same round trip
         with database_operation_duration.labels(
             operation="store", tenant=tenant
         ).time():
-            memory.id = await self._store_in_db(tenant, memory)
-
-        # Get splash
-        splash = await self._get_splash(tenant, memory)
+            memory.id, splash = await self._store_in_db(tenant, memory)
+        self._quiet.pop(tenant, None)
 
-        # Update memory count gauge
-        await self._update_memory_count(tenant)
+        # Update memory count gauge (recounted by refresh_memory_counts)
+        current_memory_count.labels(tenant=tenant).inc()
 
         return memory, splash
 
+    async def store_many(
+        self, tenant: str, items: list[tuple[str, list[str]]]
+    ) -> list[Memory]:
+        """Store several memories at once.
+
+        Embeddings are requested concurrently (at most EMBED_CONCURRENCY at a
+        time), spaCy runs over the whole batch with nlp.pipe - user tags
+        included, off the event loop - and every row goes in with one COPY.
+        No splash is computed.
+
+        Args:
+            items: (content, user_tags) pairs
+
+        Returns:
+            The stored memories, in the order given
+        """
+        memories = [Memory(content=content) for content, _ in items]
+        if not memories:
+            return []
+
+        slots = asyncio.Semaphore(EMBED_CONCURRENCY)
+
+        async def embed(memory: Memory) -> None:
+            async with slots:
+                memory.embedding = await self._get_embedding(memory.content)
+
+        async def extract() -> None:
+            # User tags first: auto-tagging skips anything already tagged
+            await asyncio.to_thread(
+                self._add_tags_batch_sync, memories, [tags for _, tags in items]
+            )
+            if settings.nlp_processes and len(memories) >= PROCESS_BATCH_MIN:
+                await self._extract_features_in_processes(memories)
+            else:
+                await asyncio.to_thread(self._extract_features_batch_sync, memories)
+
+        await asyncio.gather(extract(), *(embed(memory) for memory in memories))
+
+        with database_operation_duration.labels(
+            operation="store_many", tenant=tenant
+        ).time():
+            ids = await self._store_many_in_db(tenant, memories)
+        for memory, memory_id in zip(memories, ids, strict=True):
+            memory.id = memory_id
+        self._quiet.pop(tenant, None)
+
+        current_memory_count.labels(tenant=tenant).inc(len(memories))
+
+        return memories
+
     async def _extract_features(self, memory: Memory) -> None:
         """Extract entities, actions, and auto-tags from memory content."""
         # Run synchronous spaCy processing in thread pool
@@ -103,8 +228,64 @@ class MemoryRepository:
 
     def _extract_features_sync(self, memory: Memory) -> None:
         """Synchronous feature extraction - runs in thread pool only."""
-        doc = self.nlp(memory.content)
+        self._apply_features(memory, self.nlp(memory.content))
+
+    def _add_tags_batch_sync(
+        self, memories: list[Memory], user_tags: list[list[str]]
+    ) -> None:
+        """Add each memory's user tags, normalizing all of them in one spaCy batch."""
+        tags = [[Tag(tag) for tag in memory_tags] for memory_tags in user_tags]
+        Tag.normalize_all(itertools.chain.from_iterable(tags))
+        for memory, memory_tags in zip(memories, tags, strict=True):
+            memory.add_tags(*memory_tags)
+
+    def _extract_features_batch_sync(self, memories: list[Memory]) -> None:
+        """Feature extraction for a batch, as one nlp.pipe pass."""
+        docs = self.nlp.pipe([memory.content for memory in memories], batch_size=32)
+        for memory, doc in zip(memories, docs, strict=True):
+            self._apply_features(memory, doc)
+
+    async def _extract_features_in_processes(self, memories: list[Memory]) -> None:
+        """Feature extraction for a batch, parsed across the worker processes.
+
+        Docs come back as DocBin bytes and are restored against this
+        process's vocab, so _apply_features sees the same Doc API.
+        """
+        if self._nlp_pool is None:
+            # spawn, not fork: this process has an event loop and threads
+            self._nlp_pool = ProcessPoolExecutor(
+                max_workers=settings.nlp_processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=preload_nlp,
+                initargs=(SPACY_MODEL,),
+            )
 
+        size = -(-len(memories) // settings.nlp_processes)  # ceil division
+        chunks = [memories[i : i + size] for i in range(0, len(memories), size)]
+        loop = asyncio.get_running_loop()
+        parsed = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    self._nlp_pool, _parse_batch, [memory.content for memory in chunk]
+                )
+                for chunk in chunks
+            )
+        )
+        await asyncio.to_thread(self._apply_parsed, memories, parsed)
+
+    def _apply_parsed(self, memories: list[Memory], parsed: list[bytes]) -> None:
+        """Apply features from worker-parsed DocBins, in batch order."""
+        from spacy.tokens import DocBin
+
+        vocab = self.nlp.vocab
+        docs = itertools.chain.from_iterable(
+            DocBin().from_bytes(data).get_docs(vocab) for data in parsed
+        )
+        for memory, doc in zip(memories, docs, strict=True):
+            self._apply_features(memory, doc)
+
+    def _apply_features(self, memory: Memory, doc) -> None:
+        """Add entities, actions, and auto-tags from a parsed doc."""
         # Extract entities
         for ent in doc.ents:
             memory.add_entity(Entity(text=ent.text, type=ent.label_))
@@ -131,16 +312,13 @@ class MemoryRepository:
 
         # 2. Add noun chunk tags if we need more
         if len(auto_tags) < 5:
-            for chunk in doc.noun_chunks:
+            for chunk in self._noun_chunks(doc):
                 if len(auto_tags) >= 5:
                     break
 
-                # Be conservative - skip pronouns, single stopwords, very short chunks
-                if (
-                    chunk.root.pos_ == "PRON"
-                    or (len(chunk) == 1 and chunk.root.is_stop)
-                    or len(chunk.text) < 3
-                ):
+                # Be conservative - skip single stopwords, very short chunks
+                # (pronouns never match the chunk pattern)
+                if (len(chunk) == 1 and chunk[-1].is_stop) or len(chunk.text) < 3:
                     continue
 
                 # Skip if already in auto_tags or would duplicate user tag
@@ -168,76 +346,136 @@ class MemoryRepository:
             memory.add_tags(*auto_tags)
 
     async def _get_embedding(self, content: str) -> np.ndarray:
-        """Get embedding from configured provider."""
-        return await self.embedding_provider.embed(content)
+        """Get a unit-length embedding from the configured provider.
 
-    async def _store_in_db(self, tenant: str, memory: Memory) -> int:
-        """Store memory in database, return ID."""
+        Stored and query vectors are normalized so the inner-product index
+        ranks exactly like cosine similarity. Repeated texts (the same
+        search run again) are served from an LRU instead of the provider.
+        """
+        key = hashlib.blake2b(content.encode(), digest_size=16).digest()
+        embedding = self._embed_cache.get(key)
+        if embedding is not None:
+            self._embed_cache.move_to_end(key)
+            return embedding
+
+        # float32 whatever the provider returns: halfvec binds and every
+        # Memory downstream expect it
+        embedding = (await self.embedding_provider.embed(content)).astype(
+            np.float32, copy=False
+        )
+        norm = np.linalg.norm(embedding)
+        if norm > 0:
+            embedding = embedding / norm
+        # Shared between callers from here on
+        embedding.flags.writeable = False
+
+        self._embed_cache[key] = embedding
+        if len(self._embed_cache) > EMBED_CACHE_SIZE:
+            self._embed_cache.popitem(last=False)
+        return embedding
+
+    async def _store_in_db(
+        self, tenant: str, memory: Memory
+    ) -> tuple[int, list[Memory]]:
+        """Store memory in database in a single round trip.
+
+        The insert and the splash (memories in the 0.7-0.9 similarity sweet
+        spot, at most 3) come back from one statement.
+
+        Returns:
+            (memory_id, splash_memories)
+        """
         async with self.db_pool.acquire_tenant(tenant) as conn:
-            # Convert numpy array to list for storage
-            embedding_list = (
-                memory.embedding.tolist() if memory.embedding is not None else None
+            # halfvec column: send FP16 so the codec doesn't have to downcast
+            embedding_half = (
+                memory.embedding.astype(np.float16)
+                if memory.embedding is not None
+                else None
             )
 
-            # Prepare metadata for JSON serialization
-            # Convert sets to lists since sets aren't JSON serializable
-            metadata_for_storage = memory.metadata.copy()
-            if "tags" in metadata_for_storage and isinstance(
-                metadata_for_storage["tags"], set
-            ):
-                metadata_for_storage["tags"] = sorted(metadata_for_storage["tags"])
-
-            # Store and get the generated ID
-            row = await conn.fetchrow(
+            # Every part of the statement reads the same snapshot, so the
+            # splash doesn't see the row being inserted (it would be its own
+            # 1.0 match, outside the band anyway).
+            # Embeddings are unit-length, so the inner product is the cosine
+            # similarity. pgvector's <#> returns the *negative* inner product
+            # (smaller = closer), so similarity = -(embedding <#> $2).
+            # The ANN index is only used for ORDER BY <bare distance> ASC
+            # LIMIT k, so take the nearest candidates first, then apply the band.
+            # The LEFT JOIN returns the new id even when the splash is empty.
+            rows = await conn.fetch(
                 """
-                INSERT INTO memories (content, embedding, metadata)
-                VALUES ($1, $2, $3::jsonb)
-                RETURNING id
+                WITH inserted AS (
+                    INSERT INTO memories (content, embedding, metadata, created_at)
+                    VALUES ($1, $2, $3::jsonb, $4)
+                    RETURNING id
+                ),
+                splash AS (
+                    SELECT id, content, embedding, metadata, similarity
+                    FROM (
+                        SELECT id, content, embedding, metadata,
+                               -(embedding <#> $2) as similarity
+                        FROM memories
+                        WHERE NOT forgotten
+                        AND embedding IS NOT NULL
+                        ORDER BY embedding <#> $2 ASC
+                        LIMIT $5
+                    ) nearest
+                    WHERE similarity > 0.7
+                    AND similarity < 0.9
+                    ORDER BY similarity DESC
+                    LIMIT 3
+                )
+                SELECT inserted.id AS inserted_id, splash.*
+                FROM inserted
+                LEFT JOIN splash ON true
+                ORDER BY splash.similarity DESC
                 """,
                 memory.content,
-                embedding_list,
-                json.dumps(metadata_for_storage),  # Convert dict to JSON string
+                embedding_half,
+                memory.metadata,  # The connection's JSONB codec serializes it
+                datetime.fromisoformat(memory.metadata["created_at"]),
+                SPLASH_CANDIDATES,
             )
-            return row["id"]
 
-    async def _get_splash(self, tenant: str, memory: Memory) -> list[Memory]:
-        """Get memories in the similarity sweet spot (0.7-0.9).
+            splash = [self._row_to_memory(row) for row in rows if row["id"] is not None]
+            return rows[0]["inserted_id"], splash
 
-        Returns up to 3 memories with similarity between 0.7 and 0.9.
-        Empty list is valid if no memories fall in this range.
-        """
-        if memory.embedding is None:
-            return []
+    async def _store_many_in_db(self, tenant: str, memories: list[Memory]) -> list[int]:
+        """Insert a batch of memories with COPY.
+
+        COPY can't return generated values, so the ids are drawn from the
+        sequence first (one query) and written explicitly.
 
+        Returns:
+            The new memory ids, in the order given
+        """
         async with self.db_pool.acquire_tenant(tenant) as conn:
-            # pgvector uses <=> for cosine distance (0 = identical, 2 = opposite)
-            # similarity = 1 - distance, so:
-            # distance < 0.3 means similarity > 0.7
-            # distance > 0.1 means similarity < 0.9
-            rows = await conn.fetch(
+            ids = await conn.fetchval(
                 """
-                SELECT id, content, embedding, metadata,
-                       1 - (embedding <=> $1) as similarity
-                FROM memories
-                WHERE NOT forgotten
-                AND embedding IS NOT NULL
-                AND embedding <=> $1 < 0.3  -- similarity > 0.7
-                AND embedding <=> $1 > 0.1  -- similarity < 0.9
-                ORDER BY embedding <=> $1
-                LIMIT 3
+                SELECT array_agg(nextval('public.memories_by_tenant_id_seq'))
+                FROM generate_series(1, $1)
                 """,
-                memory.embedding.tolist(),
+                len(memories),
             )
-
-            return [self._row_to_memory(row) for row in rows]
-
-    async def _update_memory_count(self, tenant: str) -> None:
-        """Update the memory count gauge for a tenant."""
-        async with self.db_pool.acquire_tenant(tenant) as conn:
-            count = await conn.fetchval(
-                "SELECT COUNT(*) FROM memories WHERE NOT forgotten"
+            # tenant and forgotten take the partition's column defaults
+            await conn.copy_records_to_table(
+                "memories",
+                columns=["id", "content", "embedding", "metadata", "created_at"],
+                records=[
+                    (
+                        memory_id,
+                        memory.content,
+                        # halfvec column: send FP16 so the codec doesn't downcast
+                        memory.embedding.astype(np.float16)
+                        if memory.embedding is not None
+                        else None,
+                        memory.metadata,
+                        datetime.fromisoformat(memory.metadata["created_at"]),
+                    )
+                    for memory_id, memory in zip(ids, memories, strict=True)
+                ],
             )
-            current_memory_count.labels(tenant=tenant).set(count or 0)
+            return ids
 
     async def search(self, tenant: str, query: str, limit: int = 10) -> list[Memory]:
         """Unified search across text, features, and semantic similarity.
@@ -256,6 +494,11 @@ class MemoryRepository:
         FEATURE_WEIGHT = 0.2  # Tags/entities/actions  # noqa: N806
         SEMANTIC_WEIGHT = 0.4  # Semantic similarity  # noqa: N806
 
+        # Nearest neighbours fetched per requested result before the
+        # similarity cutoff and score fusion
+        SEMANTIC_CANDIDATES = 4  # noqa: N806
+        candidates = limit * SEMANTIC_CANDIDATES
+
         # Get embedding for semantic search
         query_embedding = await self._get_embedding(query)
 
@@ -267,74 +510,98 @@ class MemoryRepository:
             operation="search", tenant=tenant
         ).time():
             async with self.db_pool.acquire_tenant(tenant) as conn:
-                rows = await conn.fetch(
-                    """
-                WITH text_search AS (
-                    -- Full-text search using tsvector
-                    SELECT id,
-                           ts_rank(content_tsv, plainto_tsquery('english', $1)) as score
-                    FROM memories
-                    WHERE NOT forgotten
-                    AND content_tsv @@ plainto_tsquery('english', $1)
-                ),
-                feature_search AS (
-                    -- Feature matching on tags, entities, actions
-                    SELECT id, 1.0 as score
-                    FROM memories
-                    WHERE NOT forgotten
-                    AND (
-                        -- Check if query matches any tag
-                        EXISTS (
-                            SELECT 1 FROM jsonb_array_elements_text(metadata->'tags') AS tag
-                            WHERE lower(tag) = $2
+                # One HNSW scan returns at most hnsw.ef_search rows (40 unless
+                # the database was tuned higher), so widen it for this query
+                # when it asks for more candidates than that
+                widen = candidates > DEFAULT_EF_SEARCH
+                async with conn.transaction() if widen else contextlib.nullcontext():
+                    if widen:
+                        await conn.execute(
+                            """
+                            SELECT set_config('hnsw.ef_search', GREATEST(
+                                COALESCE(NULLIF(current_setting('hnsw.ef_search', true), ''), '0')::int,
+                                $1
+                            )::text, true)
+                            """,
+                            candidates,
                         )
-                        -- Check if query matches any entity text
-                        OR EXISTS (
-                            SELECT 1 FROM jsonb_array_elements(metadata->'entities') AS entity
-                            WHERE lower(entity->>'text') = $2
-                        )
-                        -- Check if query matches any action
-                        OR EXISTS (
-                            SELECT 1 FROM jsonb_array_elements_text(metadata->'actions') AS action
-                            WHERE lower(action) = $2
+                    rows = await conn.fetch(
+                        """
+                    WITH text_search AS (
+                        -- Full-text search (expression must match idx_memories_content_fts)
+                        SELECT id,
+                               ts_rank(to_tsvector('english', content),
+                                       plainto_tsquery('english', $1)) as score
+                        FROM memories
+                        WHERE NOT forgotten
+                        AND to_tsvector('english', content) @@ plainto_tsquery('english', $1)
+                    ),
+                    feature_search AS (
+                        -- Feature matching on tags, entities, actions
+                        SELECT id, 1.0 as score
+                        FROM memories
+                        WHERE NOT forgotten
+                        AND (
+                            -- Check if query matches any tag
+                            EXISTS (
+                                SELECT 1 FROM jsonb_array_elements_text(metadata->'tags') AS tag
+                                WHERE lower(tag) = $2
+                            )
+                            -- Check if query matches any entity text
+                            OR EXISTS (
+                                SELECT 1 FROM jsonb_array_elements(metadata->'entities') AS entity
+                                WHERE lower(entity->>'text') = $2
+                            )
+                            -- Check if query matches any action
+                            OR EXISTS (
+                                SELECT 1 FROM jsonb_array_elements_text(metadata->'actions') AS action
+                                WHERE lower(action) = $2
+                            )
                         )
+                    ),
+                    semantic_search AS (
+                        -- Semantic similarity using embeddings. The ANN index is
+                        -- only used for ORDER BY <bare distance> ASC LIMIT k, so
+                        -- take the nearest candidates first, then apply the cutoff.
+                        -- <#> is the negative inner product of unit vectors.
+                        SELECT id, similarity as score
+                        FROM (
+                            SELECT id, -(embedding <#> $3::halfvec) as similarity
+                            FROM memories
+                            WHERE NOT forgotten
+                            AND embedding IS NOT NULL
+                            ORDER BY embedding <#> $3::halfvec ASC
+                            LIMIT $8
+                        ) nearest
+                        WHERE similarity > 0.5
+                    ),
+                    combined_scores AS (
+                        -- Combine all searches with weighted scoring
+                        SELECT
+                            COALESCE(t.id, f.id, s.id) as id,
+                            (COALESCE(t.score, 0) * $4) +
+                            (COALESCE(f.score, 0) * $5) +
+                            (COALESCE(s.score, 0) * $6) as final_score
+                        FROM text_search t
+                        FULL OUTER JOIN feature_search f ON t.id = f.id
+                        FULL OUTER JOIN semantic_search s ON COALESCE(t.id, f.id) = s.id
+                    )
+                    SELECT m.id, m.content, m.embedding, m.metadata, c.final_score
+                    FROM combined_scores c
+                    JOIN memories m ON c.id = m.id
+                    WHERE c.final_score > 0
+                    ORDER BY c.final_score DESC
+                    LIMIT $7
+                    """,
+                        query,  # $1 - for text search
+                        query_lower,  # $2 - for feature matching
+                        query_embedding.astype(np.float16),  # $3 - for semantic search
+                        TEXT_WEIGHT,  # $4
+                        FEATURE_WEIGHT,  # $5
+                        SEMANTIC_WEIGHT,  # $6
+                        limit,  # $7
+                        candidates,  # $8
                     )
-                ),
-                semantic_search AS (
-                    -- Semantic similarity using embeddings
-                    SELECT id,
-                           1 - (embedding <=> $3::vector) as score
-                    FROM memories
-                    WHERE NOT forgotten
-                    AND embedding IS NOT NULL
-                    AND embedding <=> $3::vector < 0.5  -- similarity > 0.5
-                ),
-                combined_scores AS (
-                    -- Combine all searches with weighted scoring
-                    SELECT
-                        COALESCE(t.id, f.id, s.id) as id,
-                        (COALESCE(t.score, 0) * $4) +
-                        (COALESCE(f.score, 0) * $5) +
-                        (COALESCE(s.score, 0) * $6) as final_score
-                    FROM text_search t
-                    FULL OUTER JOIN feature_search f ON t.id = f.id
-                    FULL OUTER JOIN semantic_search s ON COALESCE(t.id, f.id) = s.id
-                )
-                SELECT m.id, m.content, m.embedding, m.metadata, c.final_score
-                FROM combined_scores c
-                JOIN memories m ON c.id = m.id
-                WHERE c.final_score > 0
-                ORDER BY c.final_score DESC
-                LIMIT $7
-                """,
-                    query,  # $1 - for text search
-                    query_lower,  # $2 - for feature matching
-                    query_embedding.tolist(),  # $3 - for semantic search
-                    TEXT_WEIGHT,  # $4
-                    FEATURE_WEIGHT,  # $5
-                    SEMANTIC_WEIGHT,  # $6
-                    limit,  # $7
-                )
 
             return [self._row_to_memory(row) for row in rows]
 
@@ -351,8 +618,8 @@ class MemoryRepository:
                     SELECT id, content, embedding, metadata
                     FROM memories
                     WHERE NOT forgotten
-                    AND (metadata->>'created_at')::timestamptz >= $1
-                    ORDER BY (metadata->>'created_at')::timestamptz DESC
+                    AND created_at >= $1
+                    ORDER BY created_at DESC
                     LIMIT $2
                     """,
                     since,  # asyncpg handles datetime serialization
@@ -361,21 +628,88 @@ class MemoryRepository:
 
                 return [self._row_to_memory(row) for row in rows]
 
+    async def get_recent_or_empty(
+        self, tenant: str, since: DateTime, limit: int = 10
+    ) -> list[Memory]:
+        """get_recent, skipping the query for a tenant known to be quiet since then.
+
+        An empty result is remembered for QUIET_TTL seconds, so idle tenants
+        don't cost a round trip on every call.
+        """
+        quiet = self._quiet.get(tenant)
+        if quiet is not None and since >= quiet[0] and time.monotonic() < quiet[1]:
+            return []
+
+        memories = await self.get_recent(tenant, since, limit)
+        if not memories:
+            self._quiet[tenant] = (since, time.monotonic() + QUIET_TTL)
+        return memories
+
+    async def get_recent_with_embeddings(
+        self, tenant: str, since: DateTime, limit: int = 10
+    ) -> list[Memory]:
+        """Get recent memories since a given time, skipping any without embeddings."""
+        with database_operation_duration.labels(
+            operation="get_recent_with_embeddings", tenant=tenant
+        ).time():
+            async with self.db_pool.acquire_tenant(tenant) as conn:
+                rows = await conn.fetch(
+                    """
+                    SELECT id, content, embedding, metadata
+                    FROM memories
+                    WHERE NOT forgotten
+                    AND embedding IS NOT NULL
+                    AND created_at >= $1
+                    ORDER BY created_at DESC
+                    LIMIT $2
+                    """,
+                    since,
+                    limit,
+                )
+
+                return [self._row_to_memory(row) for row in rows]
+
+    async def refresh_memory_counts(self) -> None:
+        """Set the memory count gauge for every tenant from the database.
+
+        One grouped count over the partitioned parent covers all tenants.
+        """
+        async with self.db_pool.acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT tenant, COUNT(*) AS memory_count
+                FROM public.memories_by_tenant
+                WHERE NOT forgotten
+                GROUP BY tenant
+            """)
+        for row in rows:
+            current_memory_count.labels(tenant=row["tenant"]).set(row["memory_count"])
+
+    async def refresh_memory_counts_forever(
+        self, interval: float = COUNT_REFRESH_INTERVAL
+    ) -> None:
+        """Recount now and then every interval seconds, until cancelled."""
+        while True:
+            try:
+                await self.refresh_memory_counts()
+            except Exception as e:
+                # Stores keep incrementing; the next pass corrects the drift
+                logger.warning(f"Memory count refresh failed: {e}")
+            await asyncio.sleep(interval)
+
     def _row_to_memory(self, row: dict) -> Memory:
         """Convert a database row to a Memory object."""
-        # Convert embedding back to numpy array if present
+        # Convert embedding back to numpy array if present (FP16 on disk,
+        # FP32 in memory to match what the embedding providers produce)
         embedding = None
         if row["embedding"] is not None:
-            embedding = np.array(row["embedding"])
+            embedding = row["embedding"].to_numpy().astype(np.float32)
 
-        # Convert metadata, restoring sets from lists
+        # Convert metadata, restoring sets from lists. The JSONB codec
+        # decodes a fresh dict per row, so it's ours to modify.
         metadata = row["metadata"]
-        # Handle case where metadata might be a string (from manual inserts)
+        # Handle JSON stored as a string scalar (from manual inserts)
         if isinstance(metadata, str):
-            metadata = json.loads(metadata)
-        else:
-            # asyncpg automatically decodes JSONB to dict, so copy it
-            metadata = metadata.copy()
+            metadata = orjson.loads(metadata)
 
         if "tags" in metadata and isinstance(metadata["tags"], list):
             metadata["tags"] = set(metadata["tags"])
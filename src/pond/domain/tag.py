@@ -1,29 +1,22 @@
 """Tag domain model."""
 
 import re
+from collections.abc import Iterable
+
+from .nlp import get_nlp
+
+# Lemmatizing a tag only needs the tagger and lemmatizer
+_SKIP_PIPES = ["ner"]
 
 
 class Tag:
     """A tag that knows how to normalize itself."""
 
-    # Class-level spaCy model (shared across all tags)
-    _nlp = None
-
     def __init__(self, raw: str):
         """Create a tag from raw text."""
         self.raw = raw.strip()
         self._normalized: str | None = None
 
-    @classmethod
-    def _get_nlp(cls):
-        """Lazy load spaCy model once for all tags."""
-        if cls._nlp is None:
-            import spacy
-
-            # Only load what we need for lemmatization
-            cls._nlp = spacy.load("en_core_web_lg", disable=["parser", "ner"])
-        return cls._nlp
-
     @property
     def normalized(self) -> str:
         """Get the normalized form of this tag (cached)."""
@@ -31,15 +24,31 @@ class Tag:
             self._normalized = self._normalize()
         return self._normalized
 
+    @classmethod
+    def normalize_all(cls, tags: Iterable["str | Tag"]) -> list[str]:
+        """Normalize many tags, running spaCy over them as one batch."""
+        tags = [tag if isinstance(tag, Tag) else cls(tag) for tag in tags]
+        pending = [tag for tag in tags if tag._normalized is None and tag.raw]
+        if pending:
+            texts = [tag.raw.lower() for tag in pending]
+            docs = get_nlp().pipe(texts, disable=_SKIP_PIPES)
+            for tag, text, doc in zip(pending, texts, docs, strict=True):
+                tag._normalized = cls._from_doc(text, doc)
+        return [tag.normalized for tag in tags]
+
     def _normalize(self) -> str:
         """Normalize tag using spaCy lemmatization with alphabetization."""
         text = self.raw.lower()
         if not text:
             return ""
 
-        # Process with spaCy
-        doc = self._get_nlp()(text)
+        # Process with the shared pipeline (skipping per call, not via
+        # select_pipes, which would change it under other threads)
+        return self._from_doc(text, get_nlp()(text, disable=_SKIP_PIPES))
 
+    @staticmethod
+    def _from_doc(text: str, doc) -> str:
+        """Build the normalized form of lowercased text from its spaCy doc."""
         # Get lemmas, excluding stopwords and punctuation
         lemmas = []
         for token in doc:
@@ -2,8 +2,12 @@
 
 import hashlib
 import secrets
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone
 
+from asyncpg import Connection
+
 from pond.infrastructure.database import DatabasePool
 
 
@@ -13,10 +17,31 @@ class APIKeyManager:
     # Prefix for all API keys to make them identifiable
     KEY_PREFIX = "pond_sk_"
     KEY_LENGTH = 32  # Number of random bytes (will be longer in base64)
+    MAX_KEY_LENGTH = 512  # Anything longer is garbage; don't spend a hash on it
+
+    # Validated keys are remembered briefly so a busy client doesn't cost a
+    # database round-trip per request. Keys revoked from another process
+    # (the CLI) stay valid here for at most CACHE_TTL seconds.
+    CACHE_SIZE = 1024
+    CACHE_TTL = 60.0
 
     def __init__(self, db_pool: DatabasePool):
         """Initialize with database pool."""
         self.db_pool = db_pool
+        # blake2b digest of the key -> (tenant, monotonic expiry)
+        self._cache: OrderedDict[bytes, tuple[str, float]] = OrderedDict()
+
+    @staticmethod
+    def _cache_key(api_key: str) -> bytes:
+        """Cache key for an API key (never the raw key itself)."""
+        return hashlib.blake2b(api_key.encode(), digest_size=16).digest()
+
+    def invalidate(self, api_key: str | None = None) -> None:
+        """Forget a cached key, or every cached key if none is given."""
+        if api_key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(self._cache_key(api_key), None)
 
     @staticmethod
     def generate_key() -> str:
@@ -29,69 +54,157 @@ class APIKeyManager:
         """Hash an API key for storage."""
         return hashlib.sha256(api_key.encode()).hexdigest()
 
-    async def create_key(self, tenant: str, description: str | None = None) -> str:
+    async def create_key(
+        self,
+        tenant: str,
+        description: str | None = None,
+        conn: Connection | None = None,
+    ) -> str:
         """Create a new API key for a tenant.
 
+        Args:
+            tenant: Tenant the key belongs to
+            description: Shown in key listings
+            conn: Connection to insert on (e.g. inside a caller's
+                transaction) instead of acquiring one from the pool
+
         Returns:
             The API key (only shown once!)
         """
         api_key = self.generate_key()
         key_hash = self.hash_key(api_key)
+        description = (
+            description
+            or f"API key created at {datetime.now(timezone.utc).isoformat()}"
+        )
 
-        async with self.db_pool.acquire_tenant(tenant) as conn:
-            await conn.execute(
-                """
-                INSERT INTO api_keys (key_hash, description, active)
-                VALUES ($1, $2, true)
-                """,
-                key_hash,
-                description
-                or f"API key created at {datetime.now(timezone.utc).isoformat()}",
-            )
+        if conn is None:
+            async with self.db_pool.acquire_tenant(tenant) as conn:
+                await self._insert_key(conn, tenant, key_hash, description)
+        else:
+            await self._insert_key(conn, tenant, key_hash, description)
 
         return api_key
 
-    async def validate_key(self, api_key: str) -> str:
+    @staticmethod
+    async def _insert_key(
+        conn: Connection, tenant: str, key_hash: str, description: str
+    ) -> None:
+        # Schema-qualified, so it doesn't depend on the connection's search_path
+        await conn.execute(
+            f"""
+            INSERT INTO {_quote_ident(tenant)}.api_keys (key_hash, description, active)
+            VALUES ($1, $2, true)
+            """,  # noqa: S608
+            key_hash,
+            description,
+        )
+
+    @classmethod
+    def _well_formed(cls, api_key: str) -> bool:
+        """Cheap shape check, run before a key is ever hashed."""
+        return (
+            bool(api_key)
+            and len(api_key) <= cls.MAX_KEY_LENGTH
+            and api_key.startswith(cls.KEY_PREFIX)
+        )
+
+    def cached_tenant(self, api_key: str) -> str | None:
+        """Return the tenant for a recently validated key, or None.
+
+        Synchronous, so callers can skip the await (and the database) when a
+        busy client's key is already known; on None, call validate_key with
+        cache_checked=True. Malformed keys are never hashed.
+        """
+        if not self._well_formed(api_key):
+            return None
+        cache_key = self._cache_key(api_key)
+        cached = self._cache.get(cache_key)
+        if cached is None:
+            return None
+        tenant, expires_at = cached
+        if time.monotonic() >= expires_at:
+            del self._cache[cache_key]
+            return None
+        self._cache.move_to_end(cache_key)
+        return tenant
+
+    async def validate_key(self, api_key: str, *, cache_checked: bool = False) -> str:
         """Validate an API key and return the tenant name if valid.
 
         This checks ALL tenant schemas to find which tenant owns the key.
 
+        Args:
+            api_key: Key as provided by the client
+            cache_checked: The caller already got None from cached_tenant,
+                so go straight to the database
+
         Returns:
             Tenant name if valid
 
         Raises:
             ValueError: If the API key is invalid or not found
         """
-        if not api_key or not api_key.startswith(self.KEY_PREFIX):
+        if not self._well_formed(api_key):
             raise ValueError("Invalid API key format")
 
+        if not cache_checked:
+            tenant = self.cached_tenant(api_key)
+            if tenant is not None:
+                return tenant
+
+        return await self._validate_uncached(api_key)
+
+    async def _validate_uncached(self, api_key: str) -> str:
+        """Look a well-formed key up in every tenant and cache the result."""
+        # Keys are only ever compared as fixed-length SHA-256 digests (in
+        # the api_keys lookup below), so nothing about the stored key's
+        # length or content depends on how much of the provided key matches
         key_hash = self.hash_key(api_key)
 
-        # Get list of all tenants
         async with self.db_pool.acquire() as conn:
             from pond.infrastructure.schema import list_tenants
 
             tenants = await list_tenants(conn)
+            if not tenants:
+                raise ValueError("API key not found or inactive")
 
-        # Check each tenant's api_keys table
-        for tenant in tenants:
-            async with self.db_pool.acquire_tenant(tenant) as conn:
-                # Atomically update last_used and check if key exists in one operation
-                # This avoids the race condition between SELECT and UPDATE
-                update_result = await conn.execute(
-                    """
-                    UPDATE api_keys
+            # Check every tenant's api_keys table in one statement rather
+            # than a search_path switch and UPDATE per tenant. Each CTE
+            # atomically bumps last_used for a matching active key (no race
+            # between SELECT and UPDATE), and data-modifying CTEs always run
+            # to completion, so this behaves like the per-tenant UPDATEs.
+            # Schema names come from the catalog and are quoted; the key
+            # hash is always a bind parameter.
+            updates = ",\n".join(
+                f"""
+                t{i} AS (
+                    UPDATE {_quote_ident(tenant)}.api_keys
                     SET last_used = NOW()
                     WHERE key_hash = $1 AND active = true
-                    """,
-                    key_hash,
-                )
+                    RETURNING {i} AS tenant_index
+                )"""  # noqa: S608
+                for i, tenant in enumerate(tenants)
+            )
+            matches = " UNION ALL ".join(
+                f"SELECT tenant_index FROM t{i}"  # noqa: S608
+                for i in range(len(tenants))
+            )
+            tenant_index = await conn.fetchval(
+                f"WITH {updates} {matches} LIMIT 1", key_hash
+            )
 
-                # If we updated a row, the key exists and is active
-                if update_result != "UPDATE 0":
-                    return tenant
+        if tenant_index is None:
+            raise ValueError("API key not found or inactive")
 
-        raise ValueError("API key not found or inactive")
+        tenant = tenants[tenant_index]
+        self._cache[self._cache_key(api_key)] = (
+            tenant,
+            time.monotonic() + self.CACHE_TTL,
+        )
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return tenant
 
     async def rotate_key(self, tenant: str, old_api_key: str | None = None) -> str:
         """Create a new key and deactivate the old one.
@@ -131,6 +244,7 @@ class APIKeyManager:
                 # Create new key
                 new_key = await self.create_key(tenant, "Rotated key")
 
+        self.invalidate(old_api_key)
         return new_key
 
     async def list_keys(self, tenant: str) -> list[dict]:
@@ -164,4 +278,12 @@ class APIKeyManager:
                 """,
                 key_id,
             )
-            return result != "UPDATE 0"
+
+        # Only the id is known here, not the key, so drop everything
+        self.invalidate()
+        return result != "UPDATE 0"
+
+
+def _quote_ident(name: str) -> str:
+    """Quote a schema name for interpolation into SQL."""
+    return '"' + name.replace('"', '""') + '"'
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 
 import asyncpg
+import orjson
 from asyncpg import Connection, Pool
 
 from pond.config import settings
@@ -15,6 +18,28 @@ from pond.metrics import database_pool_connections
 logger = logging.getLogger(__name__)
 
 
+def _json_default(value: object) -> list:
+    """Serialize sets (memory tags) as sorted lists, so stored order is stable."""
+    if isinstance(value, set | frozenset):
+        return sorted(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _encode_jsonb(value: object) -> bytes:
+    # Binary jsonb is a version byte followed by the JSON text
+    return b"\x01" + orjson.dumps(value, default=_json_default)
+
+
+def _decode_jsonb(data: bytes) -> object:
+    return orjson.loads(memoryview(data)[1:])
+
+
+class TenantNotFound(LookupError):  # noqa: N818
+    """Raised when a tenant has no schema."""
+
+    pass
+
+
 class DatabasePool:
     """Manages database connection pool for the application.
 
@@ -24,8 +49,31 @@ class DatabasePool:
     - Proper connection lifecycle management
     """
 
-    def __init__(self):
+    # How long a successful query counts as proof the database is up
+    HEALTH_WINDOW = 10.0
+    # A probe that takes longer than this counts as a failure
+    PROBE_TIMEOUT = 0.5
+
+    def __init__(
+        self,
+        min_size: int | None = None,
+        max_size: int | None = None,
+        health_probe: bool = True,
+    ):
+        """Size the pool (defaults from settings).
+
+        One-shot tools that never serve health checks pass health_probe=False
+        to skip the probe connection.
+        """
         self._pool: Pool | None = None
+        self._min_size = settings.db_pool_min_size if min_size is None else min_size
+        self._max_size = settings.db_pool_max_size if max_size is None else max_size
+        self._health_probe = health_probe
+        # One connection of its own, so health probes never queue behind
+        # (or take a slot from) real traffic
+        self._probe_pool: Pool | None = None
+        # monotonic time a connection was last used without error
+        self._last_success = float("-inf")
 
     async def initialize(self) -> None:
         """Initialize the connection pool.
@@ -33,46 +81,74 @@ class DatabasePool:
         Called once at application startup.
         """
         logger.info(
-            f"Initializing database pool with {settings.db_pool_min_size}-{settings.db_pool_max_size} connections"
+            f"Initializing database pool with {self._min_size}-{self._max_size} connections"
+        )
+
+        # The pool's init hook registers the vector codec, which needs the
+        # extension to exist before the first pooled connection opens
+        conn = await asyncpg.connect(
+            settings.database_url, server_settings={"jit": "off"}
         )
+        try:
+            # Installed in the public schema, so every tenant schema sees it
+            await conn.execute("SET search_path TO public")
+            await conn.execute("CREATE EXTENSION IF NOT EXISTS vector")
+
+            version = await conn.fetchval("SELECT version()")
+            logger.info(f"Connected to PostgreSQL: {version}")
+        finally:
+            await conn.close()
 
-        # Define setup function to register vector type for each connection
-        async def setup_connection(conn):
+        # Register the vector and JSONB codecs once per physical connection.
+        # asyncpg opens min_size connections up front, so by the time the
+        # first request arrives every pooled connection is connected and ready.
+        async def init_connection(conn):
             from pgvector.asyncpg import register_vector
 
             await register_vector(conn)
+            # JSONB parameters and results are Python objects, through orjson.
+            # Binary, so COPY (always binary in asyncpg) can use it too.
+            await conn.set_type_codec(
+                "jsonb",
+                encoder=_encode_jsonb,
+                decoder=_decode_jsonb,
+                schema="pg_catalog",
+                format="binary",
+            )
 
         self._pool = await asyncpg.create_pool(
             settings.database_url,
-            min_size=settings.db_pool_min_size,
-            max_size=settings.db_pool_max_size,
+            min_size=self._min_size,
+            max_size=self._max_size,
             # Command timeout for long operations like similarity search
             command_timeout=30.0,
-            # pgvector requires this type to be registered
+            # asyncpg prepares every statement once per connection and reuses
+            # it (the default 100-entry cache is far more than the handful
+            # of statements Pond issues); don't expire them every 5 minutes
+            max_cached_statement_lifetime=0,
+            # hnsw.ef_search is deliberately not set here: it is a per-database
+            # default tuned to tenant size by migration a3f1c9e2b7d4, and a
+            # startup parameter would override it.
             server_settings={
                 "jit": "off"  # JIT can slow down pgvector operations
             },
-            # Register vector type for each connection
-            setup=setup_connection,
+            # Register vector type when each connection is opened (not on
+            # every acquire, which would cost a type-introspection round-trip)
+            init=init_connection,
         )
 
-        # Test the pool and register vector type
-        async with self._pool.acquire() as conn:
-            # Register the vector type for pgvector in public schema
-            # This makes it available to all schemas
-            await conn.execute("SET search_path TO public")
-            await conn.execute("CREATE EXTENSION IF NOT EXISTS vector")
-
-            # Register vector type with asyncpg
-            from pgvector.asyncpg import register_vector
-
-            await register_vector(conn)
-
-            version = await conn.fetchval("SELECT version()")
-            logger.info(f"Connected to PostgreSQL: {version}")
+        if self._health_probe:
+            self._probe_pool = await asyncpg.create_pool(
+                settings.database_url,
+                min_size=1,
+                max_size=1,
+                server_settings={"jit": "off"},
+            )
 
     async def close(self) -> None:
         """Close all connections in the pool."""
+        if self._probe_pool:
+            await self._probe_pool.close()
         if self._pool:
             await self._pool.close()
             logger.info("Database pool closed")
@@ -90,6 +166,28 @@ class DatabasePool:
             database_pool_connections.labels(state="idle").set(idle)
             database_pool_connections.labels(state="total").set(size)
 
+    async def is_healthy(self) -> bool:
+        """Check the database, piggy-backing on real traffic when possible.
+
+        Any connection released without error in the last HEALTH_WINDOW
+        seconds counts; only an idle pool pays for a SELECT 1, run on the
+        dedicated probe connection and bounded by PROBE_TIMEOUT.
+        """
+        if self._pool is None or self._pool.is_closing():
+            return False
+        if time.monotonic() - self._last_success < self.HEALTH_WINDOW:
+            return True
+        if self._probe_pool is None:
+            return False
+
+        try:
+            await asyncio.wait_for(
+                self._probe_pool.fetchval("SELECT 1"), self.PROBE_TIMEOUT
+            )
+        except Exception:
+            return False
+        return True
+
     @property
     def pool(self) -> Pool:
         """Get the connection pool."""
@@ -110,6 +208,7 @@ class DatabasePool:
         async with self.pool.acquire() as conn:
             self.update_pool_metrics()  # Update metrics after acquiring
             yield conn
+            self._last_success = time.monotonic()
             self.update_pool_metrics()  # Update metrics after releasing
 
     @asynccontextmanager
@@ -121,6 +220,9 @@ class DatabasePool:
         Args:
             tenant: Schema name (e.g., 'claude', 'alpha')
 
+        Raises:
+            TenantNotFound: If the tenant's schema doesn't exist
+
         Usage:
             async with db_pool.acquire_tenant('claude') as conn:
                 # All queries here run in the 'claude' schema
@@ -130,11 +232,18 @@ class DatabasePool:
             self.update_pool_metrics()  # Update metrics after acquiring
             # Set the search path for this connection
             # Use PostgreSQL's quote_ident for safety, even though tenant
-            # comes from API key validation (defense in depth)
-            quoted_tenant = await conn.fetchval("SELECT quote_ident($1)", tenant)
+            # comes from API key validation (defense in depth). Quoting from
+            # the catalog also checks the schema exists in the same trip.
+            quoted_tenant = await conn.fetchval(
+                "SELECT quote_ident(nspname) FROM pg_namespace WHERE nspname = $1",
+                tenant,
+            )
+            if quoted_tenant is None:
+                raise TenantNotFound(tenant)
             await conn.execute(f"SET search_path TO {quoted_tenant}, public")
             yield conn
             # search_path automatically resets when connection returns to pool
+            self._last_success = time.monotonic()
             self.update_pool_metrics()  # Update metrics after releasing
 
 
@@ -7,6 +7,26 @@ from asyncpg import Connection
 logger = logging.getLogger(__name__)
 
 
+def configure_hnsw_params(vector_count: int) -> dict[str, int]:
+    """Pick HNSW index parameters appropriate for a tenant's size.
+
+    Small tenants get pgvector's defaults. Larger tenants get a denser graph
+    (m), a wider build-time candidate list (ef_construction), and a wider
+    query-time candidate list (ef_search) to hold recall as the data grows.
+
+    Args:
+        vector_count: Number of embedded memories in the tenant
+
+    Returns:
+        Dict with m, ef_construction, ef_search
+    """
+    if vector_count < 100_000:
+        return {"m": 16, "ef_construction": 64, "ef_search": 40}
+    if vector_count < 1_000_000:
+        return {"m": 24, "ef_construction": 128, "ef_search": 100}
+    return {"m": 32, "ef_construction": 256, "ef_search": 200}
+
+
 async def ensure_tenant_schema(conn: Connection, tenant: str) -> None:
     """Ensure a tenant's schema exists with all required tables.
 
@@ -28,38 +48,58 @@ async def ensure_tenant_schema(conn: Connection, tenant: str) -> None:
     # Switch to the tenant's schema (include public for vector type)
     await conn.execute(f"SET search_path TO {quoted_tenant}, public")
 
-    # Create the memories table with all our features
+    # All tenants' memories share one table partitioned by tenant. It is not
+    # called "memories" so a schema without a partition can never resolve
+    # that name to every tenant's rows through the public search_path.
     await conn.execute("""
-        CREATE TABLE IF NOT EXISTS memories (
-            id SERIAL PRIMARY KEY,
+        CREATE SEQUENCE IF NOT EXISTS public.memories_by_tenant_id_seq
+    """)
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS public.memories_by_tenant (
+            id INTEGER NOT NULL DEFAULT nextval('public.memories_by_tenant_id_seq'),
+            tenant TEXT NOT NULL,
             content TEXT NOT NULL,
-            content_tsv tsvector GENERATED ALWAYS AS (to_tsvector('english', content)) STORED,
-            embedding vector(768),
-            forgotten BOOLEAN DEFAULT false,
+            embedding halfvec(768),
+            forgotten BOOLEAN NOT NULL DEFAULT false,
             metadata JSONB DEFAULT '{}',
+            created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+            -- Must cover both partitioning levels; id leads so lookups by
+            -- id alone can use it
+            PRIMARY KEY (id, tenant, forgotten),
 
             -- Constraints from our spec
             CONSTRAINT content_not_empty CHECK (char_length(content) > 0),
             CONSTRAINT content_max_length CHECK (char_length(content) <= 7500)
-        )
+        ) PARTITION BY LIST (tenant)
+    """)
+    await conn.execute("""
+        ALTER SEQUENCE public.memories_by_tenant_id_seq
+        OWNED BY public.memories_by_tenant.id
+    """)
+
+    # The tenant's partition lives in its own schema as "memories", so
+    # queries under the tenant search_path never see other tenants' rows
+    tenant_literal = await conn.fetchval("SELECT quote_literal($1)", tenant)
+    await conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS memories
+        PARTITION OF public.memories_by_tenant FOR VALUES IN ({tenant_literal})
+        PARTITION BY LIST (forgotten)
     """)
+    await conn.execute(
+        f"ALTER TABLE memories ALTER COLUMN tenant SET DEFAULT {tenant_literal}"
+    )
 
-    # Add tsvector column if it doesn't exist (for migration)
-    # This handles existing tables that don't have the column yet
+    # Forgetting a memory moves its row to memories_forgotten. Queries that
+    # say "WHERE NOT forgotten" are pruned to memories_active, the only
+    # partition with search indexes, so the HNSW graph holds no tombstones.
     await conn.execute("""
-        DO $$
-        BEGIN
-            IF NOT EXISTS (
-                SELECT 1 FROM information_schema.columns
-                WHERE table_schema = current_schema()
-                AND table_name = 'memories'
-                AND column_name = 'content_tsv'
-            ) THEN
-                ALTER TABLE memories
-                ADD COLUMN content_tsv tsvector
-                GENERATED ALWAYS AS (to_tsvector('english', content)) STORED;
-            END IF;
-        END $$;
+        CREATE TABLE IF NOT EXISTS memories_active
+        PARTITION OF memories FOR VALUES IN (false)
+    """)
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS memories_forgotten
+        PARTITION OF memories FOR VALUES IN (true)
     """)
 
     # Create api_keys table for tenant authentication
@@ -74,45 +114,54 @@ async def ensure_tenant_schema(conn: Connection, tenant: str) -> None:
         )
     """)
 
-    # Create indexes for performance
+    # Create indexes for performance, on the active partition only
     # Note: CREATE INDEX IF NOT EXISTS requires PostgreSQL 9.5+
 
-    # For full-text search on content
+    # For full-text search on content. An expression index rather than a
+    # stored tsvector column, so inserts don't pay for to_tsvector() and
+    # rows don't carry it; queries must use the same expression to match.
     await conn.execute("""
-        CREATE INDEX IF NOT EXISTS idx_memories_content_tsv
-        ON memories USING gin (content_tsv)
+        CREATE INDEX IF NOT EXISTS idx_memories_content_fts
+        ON memories_active USING gin (to_tsvector('english', content))
     """)
 
-    # For vector similarity search (using IVFFlat for better performance at scale)
-    await conn.execute("""
+    # For vector similarity search (HNSW keeps recall stable under inserts,
+    # unlike IVFFlat which needs periodic REINDEX as data drifts).
+    # Embeddings are stored unit-length, so inner product ranks like cosine
+    # without the per-comparison norm math.
+    # New tenants are empty, so they start at the smallest tier.
+    hnsw = configure_hnsw_params(0)
+    await conn.execute(f"""
         CREATE INDEX IF NOT EXISTS idx_memories_embedding
-        ON memories USING ivfflat (embedding vector_cosine_ops)
-        WITH (lists = 100)
-    """)
-
-    # For filtering active memories
-    await conn.execute("""
-        CREATE INDEX IF NOT EXISTS idx_memories_forgotten
-        ON memories (forgotten)
-        WHERE NOT forgotten
+        ON memories_active USING hnsw (embedding halfvec_ip_ops)
+        WITH (m = {hnsw["m"]}, ef_construction = {hnsw["ef_construction"]})
     """)
 
     # For tag searches in metadata
     await conn.execute("""
         CREATE INDEX IF NOT EXISTS idx_memories_metadata_tags
-        ON memories USING gin ((metadata->'tags'))
+        ON memories_active USING gin ((metadata->'tags'))
     """)
 
     # For entity searches in metadata
     await conn.execute("""
         CREATE INDEX IF NOT EXISTS idx_memories_metadata_entities
-        ON memories USING gin ((metadata->'entities'))
+        ON memories_active USING gin ((metadata->'entities'))
     """)
 
-    # For recent memories queries
+    # Pre-filter indexes for filtered vector search. Without a cheap path for
+    # the predicates, pgvector falls back to a seq scan that computes the
+    # distance for every row. Keep filtered ANN queries in the shape
+    # "WHERE NOT forgotten AND <predicates> ORDER BY embedding <#> $1 LIMIT k".
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_memories_metadata_path
+        ON memories_active USING gin (metadata jsonb_path_ops)
+    """)
+
+    # For recent memories queries and time-window filters (newest first)
     await conn.execute("""
         CREATE INDEX IF NOT EXISTS idx_memories_created_at
-        ON memories ((metadata->>'created_at'))
+        ON memories_active (created_at DESC)
     """)
 
     logger.info(f"Schema '{tenant}' is ready")
@@ -135,14 +184,10 @@ async def list_tenants(conn: Connection) -> list[str]:
 
 async def tenant_exists(conn: Connection, tenant: str) -> bool:
     """Check if a tenant schema exists."""
+    # The catalog directly, not the information_schema view built on it;
+    # asyncpg's statement cache keeps this prepared on each connection
     exists = await conn.fetchval(
-        """
-        SELECT EXISTS (
-            SELECT 1
-            FROM information_schema.schemata
-            WHERE schema_name = $1
-        )
-    """,
+        "SELECT EXISTS (SELECT 1 FROM pg_namespace WHERE nspname = $1)",
         tenant,
     )
     return exists
@@ -160,8 +205,8 @@ async def get_tenant_stats(conn: Connection, tenant: str) -> dict:
         SELECT
             COUNT(*) as memory_count,
             COUNT(embedding) as embedding_count,
-            MIN(metadata->>'created_at') as oldest_memory,
-            MAX(metadata->>'created_at') as newest_memory,
+            MIN(created_at) as oldest_memory,
+            MAX(created_at) as newest_memory,
             COUNT(*) FILTER (WHERE forgotten) as forgotten_count
         FROM memories
     """)
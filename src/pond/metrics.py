@@ -4,6 +4,19 @@ from functools import wraps
 
 from prometheus_client import Counter, Gauge, Histogram
 
+# HTTP metrics (recorded by PondMiddleware when ENABLE_METRICS is set)
+http_requests = Counter(
+    "pond_http_requests_total",
+    "Total HTTP requests",
+    ["method", "status"],  # status grouped: 2xx, 4xx, 5xx
+)
+
+http_request_duration = Histogram(
+    "pond_http_request_duration_seconds",
+    "HTTP request duration",
+    ["method", "path_template"],
+)
+
 # Business metrics
 memories_stored = Counter(
     "pond_memories_stored_total",
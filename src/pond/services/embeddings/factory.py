@@ -1,5 +1,7 @@
 """Factory for creating embedding providers."""
 
+from functools import lru_cache
+
 from pond.config import settings
 
 from .base import EmbeddingError, EmbeddingProvider
@@ -13,11 +15,13 @@ class EmbeddingNotConfigured(EmbeddingError):  # noqa: N818
     pass
 
 
+@lru_cache(maxsize=1)
 def get_embedding_provider() -> EmbeddingProvider:
     """Get the configured embedding provider.
 
     Uses EMBEDDING_PROVIDER from settings to determine
-    which provider to instantiate.
+    which provider to instantiate. The provider is built once per process;
+    a missing configuration raises every time and is never cached.
 
     Returns:
         Configured embedding provider instance
@@ -9,6 +9,9 @@ import structlog
 
 logger = structlog.get_logger()
 
+# halfvec (FP16 embeddings) arrived in pgvector 0.7.0
+MIN_PGVECTOR_VERSION = (0, 7, 0)
+
 
 async def check_database() -> bool:
     """Check PostgreSQL connectivity and permissions."""
@@ -68,7 +71,17 @@ async def check_pgvector() -> bool:
 
         # Try to create it (idempotent)
         await conn.execute("CREATE EXTENSION IF NOT EXISTS vector")
-        print("    ✓ pgvector extension available", flush=True)
+
+        version = await conn.fetchval(
+            "SELECT extversion FROM pg_extension WHERE extname = 'vector'"
+        )
+        if tuple(int(part) for part in version.split(".")) < MIN_PGVECTOR_VERSION:
+            required = ".".join(str(part) for part in MIN_PGVECTOR_VERSION)
+            print(f"    ✗ pgvector {version} is too old (need {required}+)", flush=True)
+            print("      Update it with: ALTER EXTENSION vector UPDATE", flush=True)
+            return False
+
+        print(f"    ✓ pgvector extension available ({version})", flush=True)
 
     except Exception as e:
         print(f"    ✗ Error checking pgvector: {e}", flush=True)
@@ -0,0 +1,104 @@
+"""Buffered log output, written by a background task instead of inline."""
+
+import asyncio
+import contextlib
+import sys
+from collections import deque
+from typing import Any, TextIO
+
+import structlog
+
+# Bounded so a burst can't grow memory; the oldest lines are dropped first
+BUFFER_SIZE = 10_000
+# Lines per write() call
+BATCH_SIZE = 128
+# Seconds between flushes
+FLUSH_INTERVAL = 0.05
+
+logger = structlog.get_logger()
+
+
+class LogBuffer:
+    """Queue of rendered log lines with a background flusher.
+
+    Until start() is called (and after stop()), lines are written straight
+    through, so CLI tools and tests that never run the app lifespan still see
+    their output immediately.
+    """
+
+    def __init__(self, file: TextIO | None = None):
+        """Buffer lines for file (sys.stdout when None, looked up per write)."""
+        self._file = file
+        self._lines: deque[str] = deque(maxlen=BUFFER_SIZE)
+        self._dropped = 0
+        self._task: asyncio.Task | None = None
+
+    @property
+    def file(self) -> TextIO:
+        return self._file or sys.stdout
+
+    def write(self, line: str) -> None:
+        """Queue a line, or write it now if no flusher is running."""
+        if self._task is None:
+            print(line, file=self.file, flush=True)
+            return
+        if len(self._lines) == BUFFER_SIZE:
+            self._dropped += 1
+        self._lines.append(line)
+
+    def flush(self) -> None:
+        """Write out everything queued, BATCH_SIZE lines at a time."""
+        file = self.file
+        lines = self._lines
+        if lines:
+            while lines:
+                batch = [lines.popleft() for _ in range(min(BATCH_SIZE, len(lines)))]
+                file.write("\n".join(batch) + "\n")
+            file.flush()
+
+        if self._dropped:
+            dropped, self._dropped = self._dropped, 0
+            # Through structlog, so it's rendered like every other line; the
+            # buffer was just drained, so it can't push a real line out
+            logger.warning("log_buffer_overflow", dropped=dropped)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            self.flush()
+
+    def start(self) -> None:
+        """Start buffering and flushing in the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flusher and write out whatever is still queued."""
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+        self.flush()
+
+
+class BufferedLogger:
+    """structlog logger that hands rendered lines to a LogBuffer."""
+
+    def __init__(self, buffer: LogBuffer):
+        self._buffer = buffer
+
+    def msg(self, message: str) -> None:
+        self._buffer.write(message)
+
+    log = debug = info = warn = warning = msg
+    failure = err = error = critical = exception = fatal = msg
+
+
+log_buffer = LogBuffer()
+
+
+def logger_factory(*args: Any) -> BufferedLogger:
+    """structlog logger factory writing through the shared log_buffer."""
+    return BufferedLogger(log_buffer)
@@ -54,7 +54,7 @@ async def db_pool() -> AsyncGenerator[DatabasePool, None]:
         """)
 
         # Create indexes
-        await conn.execute("CREATE INDEX idx_memories_embedding ON memories USING ivfflat (embedding vector_cosine_ops)")
+        await conn.execute("CREATE INDEX idx_memories_embedding ON memories USING hnsw (embedding vector_ip_ops)")
         await conn.execute("CREATE INDEX idx_memories_created_at ON memories(created_at DESC)")
         await conn.execute("CREATE INDEX idx_memories_active ON memories(active) WHERE active = true")
 
@@ -96,14 +96,10 @@ async def client(db_pool: DatabasePool) -> AsyncGenerator[AsyncClient, None]:
     # Create a test-specific app instance to avoid modifying the global one
     from fastapi import FastAPI
 
-    from pond.api.middleware import (
-        ErrorHandlingMiddleware,
-        LoggingMiddleware,
-        RequestIDMiddleware,
-    )
+    from pond.api.main import register_exception_handlers
+    from pond.api.middleware import PondMiddleware
     from pond.api.routes import health, memories
     from pond.domain import MemoryRepository
-    from pond.infrastructure.auth import APIKeyManager
 
     # Create a fresh v1 API app
     test_api_v1 = FastAPI(
@@ -111,16 +107,29 @@ async def client(db_pool: DatabasePool) -> AsyncGenerator[AsyncClient, None]:
         version="1.0.0",
     )
 
-    # Include routes
+    # Include routes and the same error handlers as the real v1 app
     test_api_v1.include_router(health.router)
     test_api_v1.include_router(memories.router)
+    register_exception_handlers(test_api_v1)
 
     # Create main test app
     test_app = FastAPI(title="Pond Test")
 
+    # MOCK authentication for testing - accepts our test API key
+    class MockAPIKeyManager:
+        """Mock key manager that accepts our test API key."""
+
+        def cached_tenant(self, api_key: str) -> str | None:
+            return None
+
+        async def validate_key(self, api_key: str, *, cache_checked: bool = False) -> str:
+            if api_key == TEST_API_KEY:
+                return TEST_TENANT
+            raise ValueError("Invalid API key")
+
     # Initialize state
     test_app.state.db_pool = db_pool
-    test_app.state.api_key_manager = APIKeyManager(db_pool)
+    test_app.state.api_key_manager = MockAPIKeyManager()
     test_app.state.memory_repository = MemoryRepository(db_pool)
 
     # Share state with v1 app
@@ -129,25 +138,7 @@ async def client(db_pool: DatabasePool) -> AsyncGenerator[AsyncClient, None]:
     # Mount v1 API
     test_app.mount("/api/v1", test_api_v1)
 
-    # Add middleware with MOCK authentication for testing
-    from starlette.middleware.base import BaseHTTPMiddleware
-    from starlette.requests import Request
-
-    class MockAuthMiddleware(BaseHTTPMiddleware):
-        """Mock auth that accepts our test API key."""
-        async def dispatch(self, request: Request, call_next):
-            # Check for API key header
-            api_key = request.headers.get("X-API-Key")
-            if api_key == TEST_API_KEY:
-                request.state.tenant = TEST_TENANT
-            else:
-                request.state.tenant = None
-            return await call_next(request)
-
-    test_app.add_middleware(MockAuthMiddleware)
-    test_app.add_middleware(ErrorHandlingMiddleware)
-    test_app.add_middleware(LoggingMiddleware)
-    test_app.add_middleware(RequestIDMiddleware)
+    test_app.add_middleware(PondMiddleware)
 
     transport = ASGITransport(app=test_app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
@@ -15,6 +15,7 @@ async def mock_app():
     """Create app with all dependencies mocked."""
     # Mock the dependencies
     mock_db_pool = MagicMock()
+    mock_db_pool.is_healthy = AsyncMock(return_value=True)
     mock_api_manager = MagicMock()
     mock_repository = AsyncMock()
 
@@ -24,11 +25,12 @@ async def mock_app():
     app.state.memory_repository = mock_repository
 
     # Mock auth to always succeed for "test-key"
-    async def mock_validate(api_key):
+    async def mock_validate(api_key, *, cache_checked=False):
         if api_key == "test-key":
             return "test_tenant"
         raise ValueError("Invalid API key")
 
+    mock_api_manager.cached_tenant = MagicMock(return_value=None)
     mock_api_manager.validate_key = AsyncMock(side_effect=mock_validate)
 
     return app, mock_repository
@@ -126,6 +128,36 @@ async def test_store_memory_with_splash(client, mock_app):
     assert "spooky action" in data["splash"][0]["content"]
 
 
+@pytest.mark.asyncio
+async def test_store_memories_batch(client, mock_app):
+    """Test storing several memories in one request."""
+    _, mock_repo = mock_app
+
+    mock_repo.store_many.return_value = [
+        Memory(id=7, content="First thing"),
+        Memory(id=8, content="Second thing"),
+    ]
+
+    response = await client.post(
+        "/api/v1/store/batch",
+        json={
+            "memories": [
+                {"content": "First thing", "tags": ["one"]},
+                {"content": "Second thing"},
+            ]
+        },
+        headers={"X-API-Key": "test-key"}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"ids": [7, 8]}
+
+    mock_repo.store_many.assert_called_once_with(
+        tenant="test_tenant",
+        items=[("First thing", ["one"]), ("Second thing", [])],
+    )
+
+
 @pytest.mark.asyncio
 async def test_search_memories(client, mock_app):
     """Test semantic search."""
@@ -222,7 +254,7 @@ async def test_init_endpoint(client, mock_app):
         )
     ]
 
-    mock_repo.get_recent.return_value = mock_memories
+    mock_repo.get_recent_or_empty.return_value = mock_memories
 
     response = await client.post(
         "/api/v1/init",
@@ -287,3 +319,36 @@ async def test_validation_content_too_long(client, mock_app):
         headers={"X-API-Key": "test-key"}
     )
     assert response.status_code == 422  # FastAPI validation error
+
+
+@pytest.mark.asyncio
+async def test_unhandled_error_returns_request_id(client, mock_app):
+    """Test that unexpected errors become a 500 tagged with the request ID."""
+    app, _ = mock_app
+    app.state.api_key_manager.validate_key = AsyncMock(
+        side_effect=RuntimeError("database on fire")
+    )
+
+    response = await client.post(
+        "/api/v1/store",
+        json={"content": "Should explode"},
+        headers={"X-API-Key": "test-key"}
+    )
+
+    assert response.status_code == 500
+    data = response.json()
+    assert data["error"] == "An internal error occurred"
+    assert data["request_id"] == response.headers["X-Request-ID"]
+
+
+async def test_inbound_request_id_is_reused(client, mock_app):
+    """Test that a valid X-Request-ID is echoed and an invalid one replaced."""
+    response = await client.get(
+        "/api/v1/health", headers={"X-Request-ID": "edge-7f3a_01"}
+    )
+    assert response.headers["X-Request-ID"] == "edge-7f3a_01"
+
+    response = await client.get(
+        "/api/v1/health", headers={"X-Request-ID": "not/a valid id!"}
+    )
+    assert response.headers["X-Request-ID"] != "not/a valid id!"
@@ -0,0 +1,126 @@
+"""Check that vector searches keep using the ANN index - needs PostgreSQL."""
+
+import contextlib
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+
+import numpy as np
+import pendulum
+import pytest
+
+from pond.domain import Memory, MemoryRepository
+from pond.infrastructure.database import DatabasePool
+from pond.infrastructure.schema import ensure_tenant_schema
+from pond.services.embeddings.mock import MockEmbedding
+
+pytestmark = pytest.mark.postgres
+
+PLAN_TENANT = "test_query_plans"
+
+
+class ExplainingConnection:
+    """Connection stand-in that EXPLAINs queries instead of running them."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self.plans: list[str] = []
+        self.ef_search: list[int] = []
+
+    def transaction(self):
+        return self._conn.transaction()
+
+    async def execute(self, query: str, *args):
+        return await self._conn.execute(query, *args)
+
+    async def fetch(self, query: str, *args):
+        # NULL until pgvector is loaded in this session
+        self.ef_search.append(
+            await self._conn.fetchval(
+                "SELECT current_setting('hnsw.ef_search', true)::int"
+            )
+        )
+        rows = await self._conn.fetch(f"EXPLAIN {query}", *args)
+        self.plans.append("\n".join(row[0] for row in rows))
+        return []
+
+
+@pytest.fixture
+async def explaining_repo(
+    monkeypatch,
+) -> AsyncGenerator[tuple[MemoryRepository, ExplainingConnection], None]:
+    """Repository whose tenant connections record query plans."""
+    pool = DatabasePool()
+    try:
+        await pool.initialize()
+    except Exception as e:
+        pytest.skip(f"PostgreSQL not available: {e}")
+
+    async with pool.acquire() as conn:
+        await ensure_tenant_schema(conn, PLAN_TENANT)
+
+    repo = MemoryRepository(pool, embedding_provider=MockEmbedding())
+
+    async with pool.acquire_tenant(PLAN_TENANT) as conn:
+        # An empty table is always cheapest to seq scan; make the planner
+        # show whether the index is usable at all
+        await conn.execute("SET enable_seqscan = off")
+        explaining = ExplainingConnection(conn)
+
+        @asynccontextmanager
+        async def acquire_tenant(tenant: str):
+            yield explaining
+
+        monkeypatch.setattr(pool, "acquire_tenant", acquire_tenant)
+        yield repo, explaining
+
+    async with pool.acquire() as conn:
+        await conn.execute(f"DROP SCHEMA IF EXISTS {PLAN_TENANT} CASCADE")
+    await pool.close()
+
+
+async def test_splash_uses_embedding_index(explaining_repo):
+    """Splash orders by the bare distance operator so HNSW is used."""
+    repo, explaining = explaining_repo
+    memory = Memory(content="Plans are nothing; planning is everything")
+    memory.embedding = np.ones(768, dtype=np.float32)
+
+    # The splash is fetched by the same statement as the insert
+    with contextlib.suppress(IndexError):  # EXPLAIN returns no inserted row
+        await repo._store_in_db(PLAN_TENANT, memory)
+
+    plan = explaining.plans[-1]
+    assert "Index Scan using idx_memories_embedding" in plan
+    assert "Seq Scan" not in plan
+
+
+async def test_search_uses_indexes(explaining_repo):
+    """Unified search hits HNSW for semantics and the FTS expression index."""
+    repo, explaining = explaining_repo
+
+    await repo.search(PLAN_TENANT, "planning", limit=5)
+
+    plan = explaining.plans[-1]
+    assert "Index Scan using idx_memories_embedding" in plan
+    assert "idx_memories_content_fts" in plan
+
+    # Past ten results the candidate list outgrows the default ef_search,
+    # which must be raised so the index scan can return all of them
+    await repo.search(PLAN_TENANT, "planning", limit=25)
+
+    plan = explaining.plans[-1]
+    assert "Index Scan using idx_memories_embedding" in plan
+    assert explaining.ef_search[-1] >= 25 * 4
+
+
+async def test_recent_uses_created_at_index(explaining_repo):
+    """Recent-memory reads are a range seek on the active partition's index."""
+    repo, explaining = explaining_repo
+    since = pendulum.now("UTC").subtract(hours=24)
+
+    await repo.get_recent(PLAN_TENANT, since, limit=10)
+    await repo.get_recent_with_embeddings(PLAN_TENANT, since, limit=10)
+
+    for plan in explaining.plans[-2:]:
+        assert "idx_memories_created_at" in plan
+        assert "memories_forgotten" not in plan
+        assert "Seq Scan" not in plan